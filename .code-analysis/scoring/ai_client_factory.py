@@ -1,19 +1,16 @@
+import importlib.util
 import os
 
-try:
-    from azure.ai.inference import ChatCompletionsClient
-    from azure.identity import DefaultAzureCredential
-    from azure.core.credentials import AzureKeyCredential
-    AZURE_AVAILABLE = True
-except ImportError:
-    AZURE_AVAILABLE = False
-    # Define placeholder classes for when Azure isn't available
-    class ChatCompletionsClient:
-        pass
-    class DefaultAzureCredential:
-        pass
-    class AzureKeyCredential:
-        pass
+AZURE_INSTALL_HINT = "Azure AI dependencies not available. Install: pip install azure-ai-inference azure-identity"
+
+
+def _azure_available() -> bool:
+    """Check whether the Azure AI SDK is installed without importing it."""
+    try:
+        return (importlib.util.find_spec("azure.ai.inference") is not None and
+                importlib.util.find_spec("azure.identity") is not None)
+    except ModuleNotFoundError:
+        return False
 
 
 class AIClientFactory:
@@ -26,6 +23,15 @@ class AIClientFactory:
         Returns:
             ChatCompletionsClient instance
         """
+        # Imported lazily: the Azure SDK is slow to import and most callers
+        # only need validate_config() or get_model_name()
+        try:
+            from azure.ai.inference import ChatCompletionsClient
+            from azure.identity import DefaultAzureCredential
+            from azure.core.credentials import AzureKeyCredential
+        except ImportError:
+            raise ValueError(AZURE_INSTALL_HINT)
+        
         endpoint = os.getenv("AI_FOUNDRY_ENDPOINT")
         if not endpoint:
             raise ValueError("AI_FOUNDRY_ENDPOINT environment variable is required")
@@ -63,8 +69,8 @@ class AIClientFactory:
         Returns:
             True if configuration is valid
         """
-        if not AZURE_AVAILABLE:
-            raise ValueError("Azure AI dependencies not available. Install: pip install azure-ai-inference azure-identity")
+        if not _azure_available():
+            raise ValueError(AZURE_INSTALL_HINT)
         
         endpoint = os.getenv("AI_FOUNDRY_ENDPOINT")
         if not endpoint:
@@ -0,0 +1,174 @@
+"""
+Shared plumbing for the file analyzers.
+
+Provides the sharded on-disk result cache layout and the process-pool fan-out
+used by ASTComplexityAnalyzer and QualityGate.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterator, Optional, Sequence, Set, Tuple
+
+# Workers are started from a clean server process rather than forked from the
+# caller, which may be running background threads (AI review, standards
+# prefetch) whose locks a forked child would inherit mid-use
+_POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+# Each new cache entry appends one byte to this file in the cache directory,
+# so its size bounds the number of entries without listing the shards
+_WRITE_LOG = 'writes.log'
+
+
+def default_cache_dir(name: str) -> str:
+    """Get the per-user cache directory for one analyzer's entries."""
+    return os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+        name
+    )
+
+
+def cache_entry_path(cache_dir: str, cache_key: str) -> str:
+    """
+    Get the disk cache path for a hex cache key.
+    
+    Entries are sharded git-style into two levels of subdirectories keyed
+    by the leading hex digits of the cache key, keeping each directory small.
+    """
+    return os.path.join(cache_dir, cache_key[:2], cache_key[2:4], cache_key[4:])
+
+
+def write_cache_entry(cache_file: str, data: bytes, known_shards: Set[str]) -> None:
+    """
+    Write a cache entry, creating its shard directory on first use.
+    
+    known_shards records the shard directories already created by the caller,
+    so each one is only made once per analyzer. New entries are counted in
+    the cache's write log; rewriting an existing one is not.
+    """
+    try:
+        shard = os.path.dirname(cache_file)
+        if shard not in known_shards:
+            os.makedirs(shard, exist_ok=True)
+            known_shards.add(shard)
+        try:
+            f = open(cache_file, 'xb')
+            is_new = True
+        except FileExistsError:
+            f = open(cache_file, 'wb')
+            is_new = False
+        with f:
+            f.write(data)
+        if is_new:
+            # The cache directory is two shard levels up
+            log_path = os.path.join(os.path.dirname(os.path.dirname(shard)), _WRITE_LOG)
+            with open(log_path, 'ab') as log:
+                log.write(b'.')
+    except IOError:
+        pass  # Caching is optional
+
+
+def touch_cache_entry(cache_file: str) -> None:
+    """Mark a cache entry as just used, so prune_cache_dir evicts it last."""
+    try:
+        os.utime(cache_file)
+    except OSError:
+        pass  # Evicted meanwhile; the next miss writes it again
+
+
+def prune_cache_dir(cache_dir: str, max_entries: int) -> None:
+    """
+    Evict the least recently used cache entries beyond max_entries.
+    
+    Entries are ordered by mtime, which write_cache_entry sets and
+    touch_cache_entry refreshes on every hit. Listing the cache stats every
+    entry, so it only happens once the write log says the cap may have been
+    passed, or when there is no log yet.
+    """
+    log_path = os.path.join(cache_dir, _WRITE_LOG)
+    try:
+        if os.stat(log_path).st_size <= max_entries:
+            return
+    except OSError:
+        pass  # No log yet: count the entries by listing them
+    
+    entries = []
+    try:
+        for shard in os.scandir(cache_dir):
+            if not shard.is_dir():
+                continue
+            for subshard in os.scandir(shard.path):
+                if subshard.is_dir():
+                    entries.extend(
+                        (entry.stat().st_mtime_ns, entry.path)
+                        for entry in os.scandir(subshard.path)
+                    )
+    except OSError:
+        return  # No cache yet, or it is being modified concurrently
+    
+    excess = len(entries) - max_entries
+    if excess > 0:
+        entries.sort()
+        for _mtime_ns, path in entries[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already evicted by another process
+    
+    # Restart the log from the entries that are left
+    try:
+        with open(log_path, 'wb') as log:
+            log.write(b'.' * min(len(entries), max_entries))
+    except OSError:
+        pass  # The cache is listed again on the next prune
+
+
+def _start_pool_map(func: Callable[[Any], Any],
+                    items: Sequence[Any]) -> Optional[Tuple[ProcessPoolExecutor, Iterator[Any]]]:
+    """
+    Submit func over items to a new process pool.
+    
+    Returns the pool and its ordered results, or None if no pool can be
+    started here. Errors raised by func only surface from the results.
+    """
+    executor = None
+    try:
+        executor = ProcessPoolExecutor(mp_context=_POOL_CONTEXT)
+        # Submitting the items is what starts the workers
+        return executor, executor.map(func, items, chunksize=8)
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        return None
+
+
+def map_in_pool(func: Callable[[Any], Any], items: Sequence[Any],
+                min_items: int) -> Iterator[Any]:
+    """
+    Apply func to each item, yielding the results in order.
+    
+    Batches of min_items or more are spread across a process pool; smaller
+    batches run serially since pool startup would dominate. Work still queued
+    in the pool is cancelled if the caller stops early. If no pool can be
+    started, or a worker dies, the outstanding items are run serially;
+    exceptions raised by func propagate as they are.
+    """
+    done = 0
+    pool = _start_pool_map(func, items) if len(items) >= min_items else None
+    if pool is not None:
+        executor, results = pool
+        with executor:
+            try:
+                for result in results:
+                    yield result
+                    done += 1
+                return
+            except BrokenProcessPool:
+                pass  # A worker died, process the rest serially
+            finally:
+                executor.shutdown(cancel_futures=True)
+    
+    yield from map(func, items[done:])
@@ -7,16 +7,25 @@ for supported languages, with fallback to heuristic analysis for unsupported lan
 
 import ast
 import hashlib
-import json
 import os
+import re
+import struct
 from abc import ABC, abstractmethod
 from functools import lru_cache
-from typing import Dict, List, Optional, Tuple, Union
+from itertools import accumulate, compress
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .analysis_utils import cache_entry_path, default_cache_dir, map_in_pool, prune_cache_dir, touch_cache_entry, write_cache_entry
 
 
 class ComplexityMetrics:
     """Container for complexity metrics from AST analysis."""
     
+    __slots__ = (
+        'cyclomatic_complexity', 'nesting_depth', 'function_count',
+        'function_length_penalty', 'control_structures', 'file_size_penalty',
+        'total_score'
+    )
+    
     def __init__(self):
         self.cyclomatic_complexity = 0
         self.nesting_depth = 0
@@ -39,9 +48,115 @@ class ComplexityMetrics:
         }
 
 
+def _compile_keywords(keywords: List[str]) -> 're.Pattern':
+    """
+    Compile lowercase control keywords into a single alternation.
+    
+    Searched against lowercased text, a line matches exactly when one of the
+    keywords is a substring of the stripped line, so a keyword ending in a
+    space only counts when more text follows it on the line.
+    
+    Keywords are factored into a trie so that shared prefixes are matched
+    once, letting the regex engine scan each position much like an
+    Aho-Corasick automaton instead of retrying every keyword in turn.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            if None in node:
+                break  # A shorter keyword already matches this prefix
+            node = node.setdefault(char, {})
+        else:
+            node.clear()  # Longer keywords sharing this prefix are redundant
+            node[None] = r'(?=.*\S)' if keyword != keyword.rstrip() else ''
+    return re.compile(_trie_pattern(trie))
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Render a keyword trie built by _compile_keywords as a regex."""
+    if None in node:
+        return node[None]
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in node.items()]
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+def _count_matching_lines(regex: 're.Pattern', text: str) -> int:
+    """Count the lines of text containing at least one match of regex."""
+    count = 0
+    pos = 0
+    while True:
+        match = regex.search(text, pos)
+        if not match:
+            return count
+        count += 1
+        # Skip the rest of the line: each line counts at most once
+        pos = text.find('\n', match.end())
+        if pos < 0:
+            return count
+
+
+def _bracket_tables(opening: bytes, closing: bytes) -> Tuple[bytes, List[int]]:
+    """Build the byte deletion set and per-byte depth deltas for a bracket set."""
+    keep = set(opening + closing + b'\n')
+    delete = bytes(b for b in range(256) if b not in keep)
+    deltas = [0] * 256
+    for b in opening:
+        deltas[b] = 1
+    for b in closing:
+        deltas[b] = -1
+    return delete, deltas
+
+
+def _max_bracket_depth(code: str, tables: Tuple[bytes, List[int]]) -> int:
+    """
+    Get the maximum running bracket depth, sampled at the end of each line.
+    
+    The scan stays in C: bytes.translate drops everything except brackets and
+    newlines, and itertools.accumulate carries the running depth.
+    """
+    delete, deltas = tables
+    data = code.encode('utf-8', 'ignore').translate(None, delete) + b'\n'
+    depths = accumulate(map(deltas.__getitem__, data))
+    line_ends = map((0x0A).__eq__, data)
+    return max(0, max(compress(depths, line_ends), default=0))
+
+
+def _parse_python(code: str) -> ast.Module:
+    """Parse Python source; same as ast.parse, minus its wrapper and the caller's future flags."""
+    return compile(code, '<unknown>', 'exec', ast.PyCF_ONLY_AST, dont_inherit=True)
+
+
+def _child_field_table(leaf_types: Tuple[type, ...],
+                       leaf_fields: Tuple[str, ...]) -> Dict[type, Tuple[str, ...]]:
+    """
+    Map every AST node type to the fields a complexity walk should descend.
+    
+    Built once at import so the walk indexes a dict instead of iterating
+    each node's full _fields.
+    """
+    table = {}
+    pending = [ast.AST]
+    while pending:
+        node_type = pending.pop()
+        pending.extend(node_type.__subclasses__())
+        if issubclass(node_type, leaf_types):
+            table[node_type] = ()
+        else:
+            table[node_type] = tuple(
+                field for field in node_type._fields if field not in leaf_fields
+            )
+    return table
+
+
 class ASTAnalyzer(ABC):
     """Abstract base class for language-specific AST analyzers."""
     
+    # File extensions claimed by this analyzer, used for dispatch
+    EXTENSIONS: Tuple[str, ...] = ()
+    
     @abstractmethod
     def analyze(self, code: str, file_path: str) -> ComplexityMetrics:
         """Analyze code and return complexity metrics."""
@@ -56,46 +171,108 @@ class ASTAnalyzer(ABC):
 class PythonASTAnalyzer(ASTAnalyzer):
     """AST-based complexity analyzer for Python code."""
     
+    EXTENSIONS = ('.py', '.pyx', '.pyi')
+    
+    _FALLBACK_CONTROL_RE = _compile_keywords(['if ', 'for ', 'while ', 'try:', 'except:', 'with '])
+    
+    # Node kinds that affect the metrics, looked up by exact node type
+    CONTROL, HANDLER, COMPREHENSION, FUNCTION = range(4)
+    NODE_KIND = {
+        ast.If: CONTROL, ast.For: CONTROL, ast.AsyncFor: CONTROL, ast.While: CONTROL,
+        ast.With: CONTROL, ast.AsyncWith: CONTROL, ast.Try: CONTROL,
+        ast.ExceptHandler: HANDLER,
+        ast.ListComp: COMPREHENSION, ast.SetComp: COMPREHENSION,
+        ast.DictComp: COMPREHENSION, ast.GeneratorExp: COMPREHENSION,
+        ast.FunctionDef: FUNCTION, ast.AsyncFunctionDef: FUNCTION,
+    }
+    
+    # Fields walked per node type. Context, operator and identifier fields
+    # are dropped, and leaf nodes whose subtrees can never hold a counted
+    # node are not descended at all.
+    CHILD_FIELDS = _child_field_table(
+        leaf_types=(
+            ast.Name, ast.Constant, ast.Pass, ast.Break, ast.Continue,
+            ast.Import, ast.ImportFrom, ast.Global, ast.Nonlocal, ast.alias
+        ),
+        leaf_fields=(
+            'ctx', 'op', 'ops', 'id', 'arg', 'attr', 'name', 'names', 'asname', 'module',
+            'level', 'kind', 'conversion', 'is_async', 'type_comment', 'type_ignores'
+        )
+    )
+    
     def supports_language(self, file_extension: str) -> bool:
         """Check if this analyzer supports Python files."""
-        return file_extension.lower() in ['.py', '.pyx', '.pyi']
+        return file_extension.lower() in self.EXTENSIONS
     
     def analyze(self, code: str, file_path: str) -> ComplexityMetrics:
         """Analyze Python code using AST parsing."""
         metrics = ComplexityMetrics()
         
         try:
-            tree = ast.parse(code)
+            tree = _parse_python(code)
             self._analyze_ast(tree, metrics)
-        except SyntaxError:
-            # Fall back to heuristic analysis for invalid Python
+        except (SyntaxError, ValueError):
+            # Fall back to heuristic analysis for invalid Python (ValueError
+            # covers null bytes on Python versions that don't raise SyntaxError)
             return self._fallback_analysis(code, file_path)
         
         return metrics
     
     def _analyze_ast(self, tree: ast.AST, metrics: ComplexityMetrics) -> None:
-        """Walk AST and calculate complexity metrics."""
-        
-        for node in ast.walk(tree):
-            # Count control structures for cyclomatic complexity
-            if isinstance(node, (ast.If, ast.For, ast.While, ast.With, ast.Try)):
+        """
+        Walk AST once and calculate complexity metrics.
+        
+        The walk uses an explicit stack of (node, depth, in_function) entries
+        rather than a visitor, so no generator or method dispatch runs per
+        node. Nesting depth is measured relative to the outermost enclosing
+        function and only recorded inside functions.
+        """
+        node_kind = self.NODE_KIND
+        control, handler, comprehension, function = (
+            self.CONTROL, self.HANDLER, self.COMPREHENSION, self.FUNCTION
+        )
+        child_fields = self.CHILD_FIELDS
+        AST = ast.AST
+        
+        stack = [(tree, 0, False)]
+        push = stack.append
+        while stack:
+            node, depth, in_function = stack.pop()
+            kind = node_kind.get(type(node))
+            
+            if kind == control:
                 metrics.cyclomatic_complexity += 1
                 metrics.control_structures += 1
-            
-            # Count function definitions and analyze their complexity
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                metrics.function_count += 1
-                func_metrics = self._analyze_function(node)
-                metrics.function_length_penalty += func_metrics.function_length_penalty
-                metrics.nesting_depth = max(metrics.nesting_depth, func_metrics.nesting_depth)
-            
-            # Count exception handlers
-            if isinstance(node, ast.ExceptHandler):
+                depth += 1
+                if in_function and depth > metrics.nesting_depth:
+                    metrics.nesting_depth = depth
+            elif kind == handler:
                 metrics.cyclomatic_complexity += 1
-            
-            # Count comprehensions as control structures
-            if isinstance(node, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            elif kind == comprehension:
                 metrics.control_structures += 1
+            elif kind == function:
+                metrics.function_count += 1
+                
+                # Calculate function length penalty
+                if node.end_lineno is not None:
+                    line_count = node.end_lineno - node.lineno
+                    if line_count > 50:
+                        metrics.function_length_penalty += 3
+                    elif line_count > 20:
+                        metrics.function_length_penalty += 1
+                
+                if not in_function:
+                    depth = 0
+                    in_function = True
+            
+            for field in child_fields[type(node)]:
+                value = getattr(node, field, None)
+                if type(value) is list:
+                    for item in value:
+                        if isinstance(item, AST):
+                            push((item, depth, in_function))
+                elif isinstance(value, AST):
+                    push((value, depth, in_function))
         
         # Calculate total score
         metrics.total_score = (
@@ -105,65 +282,22 @@ class PythonASTAnalyzer(ASTAnalyzer):
             metrics.file_size_penalty
         )
     
-    def _analyze_function(self, func_node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> ComplexityMetrics:
-        """Analyze a specific function for complexity metrics."""
-        func_metrics = ComplexityMetrics()
-        
-        # Calculate function length penalty
-        if hasattr(func_node, 'end_lineno') and hasattr(func_node, 'lineno'):
-            line_count = func_node.end_lineno - func_node.lineno
-            if line_count > 50:
-                func_metrics.function_length_penalty = 3
-            elif line_count > 20:
-                func_metrics.function_length_penalty = 1
-        
-        # Calculate nesting depth within function
-        func_metrics.nesting_depth = self._calculate_nesting_depth(func_node)
-        
-        return func_metrics
-    
-    def _calculate_nesting_depth(self, node: ast.AST) -> int:
-        """Calculate maximum nesting depth in a node."""
-        max_depth = 0
-        
-        def visit_node(node: ast.AST, current_depth: int = 0) -> int:
-            nonlocal max_depth
-            max_depth = max(max_depth, current_depth)
-            
-            # Nodes that increase nesting depth
-            if isinstance(node, (ast.If, ast.For, ast.While, ast.With, ast.Try)):
-                current_depth += 1
-            
-            # Recursively visit child nodes
-            for child in ast.iter_child_nodes(node):
-                visit_node(child, current_depth)
-            
-            return max_depth
-        
-        return visit_node(node)
-    
     def _fallback_analysis(self, code: str, _file_path: str) -> ComplexityMetrics:
         """Fallback to heuristic analysis when AST parsing fails."""
         metrics = ComplexityMetrics()
         lines = code.split('\n')
         
         # Count control structures using text patterns
-        control_keywords = ['if ', 'for ', 'while ', 'try:', 'except:', 'with ']
-        for line in lines:
-            line_lower = line.lower().strip()
-            for keyword in control_keywords:
-                if keyword in line_lower:
-                    metrics.control_structures += 1
-                    break
+        metrics.control_structures = _count_matching_lines(self._FALLBACK_CONTROL_RE, code.lower())
         
         # Estimate nesting depth by indentation
         max_indent = 0
         for line in lines:
-            if line.strip():
-                indent = len(line) - len(line.lstrip())
-                max_indent = max(max_indent, indent // 4)  # Assume 4-space indentation
+            content = line.lstrip()
+            if content:
+                max_indent = max(max_indent, len(line) - len(content))
         
-        metrics.nesting_depth = max_indent
+        metrics.nesting_depth = max_indent // 4  # Assume 4-space indentation
         metrics.cyclomatic_complexity = metrics.control_structures
         
         # File size penalty
@@ -184,44 +318,35 @@ class PythonASTAnalyzer(ASTAnalyzer):
 class JavaScriptASTAnalyzer(ASTAnalyzer):
     """Heuristic-based complexity analyzer for JavaScript/TypeScript."""
     
+    EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs')
+    
+    # Control structures
+    _CONTROL_RE = _compile_keywords([
+        'if ', 'for ', 'while ', 'switch ', 'catch ', 'try ',
+        'function ', '=>', '.then(', '.catch('
+    ])
+    _BRACES = _bracket_tables(b'{', b'}')
+    
     def supports_language(self, file_extension: str) -> bool:
         """Check if this analyzer supports JavaScript/TypeScript files."""
-        return file_extension.lower() in ['.js', '.jsx', '.ts', '.tsx', '.mjs']
+        return file_extension.lower() in self.EXTENSIONS
     
     def analyze(self, code: str, file_path: str) -> ComplexityMetrics:
         """Analyze JavaScript/TypeScript code using pattern matching."""
         metrics = ComplexityMetrics()
-        lines = code.split('\n')
+        line_count = code.count('\n') + 1
         
-        # Control structures
-        control_patterns = [
-            'if ', 'for ', 'while ', 'switch ', 'catch ', 'try ',
-            'function ', '=>', '.then(', '.catch('
-        ]
+        # Count control structures
+        metrics.control_structures = _count_matching_lines(self._CONTROL_RE, code.lower())
         
-        brace_nesting = 0
-        max_nesting = 0
-        
-        for line in lines:
-            line_stripped = line.strip().lower()
-            
-            # Count control structures
-            for pattern in control_patterns:
-                if pattern in line_stripped:
-                    metrics.control_structures += 1
-                    break
-            
-            # Estimate nesting depth using braces
-            brace_nesting += line.count('{') - line.count('}')
-            max_nesting = max(max_nesting, brace_nesting)
-        
-        metrics.nesting_depth = max_nesting
+        # Estimate nesting depth using braces
+        metrics.nesting_depth = _max_bracket_depth(code, self._BRACES)
         metrics.cyclomatic_complexity = metrics.control_structures
         
         # File size penalty
-        if len(lines) > 100:
+        if line_count > 100:
             metrics.file_size_penalty = 5
-        elif len(lines) > 50:
+        elif line_count > 50:
             metrics.file_size_penalty = 2
         
         metrics.total_score = (
@@ -236,6 +361,13 @@ class JavaScriptASTAnalyzer(ASTAnalyzer):
 class GenericASTAnalyzer(ASTAnalyzer):
     """Generic fallback analyzer for unsupported languages."""
     
+    # Generic control structure patterns
+    _CONTROL_RE = _compile_keywords([
+        'if', 'for', 'while', 'switch', 'case', 'try', 'catch',
+        'function', 'def', 'class', 'struct', 'enum'
+    ])
+    _BRACKETS = _bracket_tables(b'{[(', b'}])')
+    
     def supports_language(self, file_extension: str) -> bool:
         """This analyzer supports all languages as fallback."""
         return True
@@ -244,42 +376,25 @@ class GenericASTAnalyzer(ASTAnalyzer):
         """Generic analysis using basic pattern matching."""
         metrics = ComplexityMetrics()
         lines = code.split('\n')
+        line_count = len(lines)
         
-        # Generic control structure patterns
-        control_patterns = [
-            'if', 'for', 'while', 'switch', 'case', 'try', 'catch',
-            'function', 'def', 'class', 'struct', 'enum'
-        ]
-        
-        bracket_nesting = 0
-        max_nesting = 0
+        # Skip comments and empty lines
+        code = '\n'.join(
+            line for line in lines
+            if (content := line.lstrip()) and not content.startswith(('//', '#', '/*', '*'))
+        )
         
-        for line in lines:
-            line_stripped = line.strip().lower()
-            
-            # Skip comments and empty lines
-            if not line_stripped or line_stripped.startswith(('//','#', '/*', '*')):
-                continue
-            
-            # Count control structures
-            for pattern in control_patterns:
-                if pattern in line_stripped:
-                    metrics.control_structures += 1
-                    break
-            
-            # Estimate nesting using brackets
-            bracket_nesting += line.count('{') - line.count('}')
-            bracket_nesting += line.count('[') - line.count(']')
-            bracket_nesting += line.count('(') - line.count(')')
-            max_nesting = max(max_nesting, bracket_nesting)
+        # Count control structures
+        metrics.control_structures = _count_matching_lines(self._CONTROL_RE, code.lower())
         
-        metrics.nesting_depth = max(max_nesting, 0)
+        # Estimate nesting using brackets
+        metrics.nesting_depth = _max_bracket_depth(code, self._BRACKETS)
         metrics.cyclomatic_complexity = metrics.control_structures
         
         # File size penalty
-        if len(lines) > 100:
+        if line_count > 100:
             metrics.file_size_penalty = 5
-        elif len(lines) > 50:
+        elif line_count > 50:
             metrics.file_size_penalty = 2
         
         metrics.total_score = (
@@ -291,128 +406,193 @@ class GenericASTAnalyzer(ASTAnalyzer):
         return metrics
 
 
+@lru_cache(maxsize=256)
+def _analyze_cached(analyzer: ASTAnalyzer, code: str) -> ComplexityMetrics:
+    """
+    Analyze code, memoized on its content.
+    
+    Files with identical content (vendored libraries, generated stubs) share
+    a single result, so the returned metrics must be treated as read-only.
+    """
+    return analyzer.analyze(code, '')
+
+
 class ASTComplexityAnalyzer:
     """Main AST-based complexity analyzer with caching and multi-language support."""
     
+    # Minimum batch size before analyze_files fans out to a process pool
+    PARALLEL_MIN_FILES = 8
+    
+    # Upper bound on disk cache entries kept by prune_cache
+    CACHE_MAX_ENTRIES = 500
+    
+    # Disk cache record: the seven metric fields in __slots__ order, then the
+    # mtime (ns) and size of the file and the blake2b digest of its contents
+    _CACHE_RECORD = struct.Struct('<7iqq16s')
+    
     def __init__(self):
         self.analyzers = [
             PythonASTAnalyzer(),
             JavaScriptASTAnalyzer(),
             GenericASTAnalyzer()  # Always last as fallback
         ]
+        # Extension dispatch table; the first analyzer claiming an extension wins
+        self._analyzers_by_extension = {}
+        for analyzer in self.analyzers:
+            for extension in analyzer.EXTENSIONS:
+                self._analyzers_by_extension.setdefault(extension, analyzer)
         self.cache_enabled = True
+        self.cache_dir = default_cache_dir('ast_analyzer')
+        self._cache_shards = set()  # Shard directories already created
     
     def analyze_file(self, file_path: str) -> ComplexityMetrics:
         """Analyze a single file and return complexity metrics."""
-        if not os.path.exists(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return ComplexityMetrics()
+        
+        # Check cache first: an entry recorded for the same mtime and size is
+        # trusted without reading the file at all
+        if self.cache_enabled:
+            cached_result = self._get_cached_result(file_path, stat)
+            if cached_result:
+                return cached_result
+        
+        # Read raw bytes once; they feed both the cache hash and the analysis
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except IOError:
             return ComplexityMetrics()
         
-        # Check cache first
+        # The file was touched, but its content may be unchanged
         if self.cache_enabled:
-            cached_result = self._get_cached_result(file_path)
+            file_hash = self._get_file_hash(data)
+            cached_result = self._get_cached_result(file_path, stat, file_hash)
             if cached_result:
+                self._cache_result(file_path, stat, file_hash, cached_result)
                 return cached_result
         
-        # Read file content
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-        except (UnicodeDecodeError, IOError):
+            code = data.decode('utf-8')
+        except UnicodeDecodeError:
             return ComplexityMetrics()
+        # Translate line endings the way a text-mode read would
+        code = code.replace('\r\n', '\n').replace('\r', '\n')
         
         # Find appropriate analyzer
         file_extension = os.path.splitext(file_path)[1]
         analyzer = self._get_analyzer(file_extension)
         
-        # Analyze code
-        metrics = analyzer.analyze(code, file_path)
+        # Analyze code (memoized in-process by content)
+        if self.cache_enabled:
+            metrics = _analyze_cached(analyzer, code)
+        else:
+            metrics = analyzer.analyze(code, file_path)
         
         # Cache result
         if self.cache_enabled:
-            self._cache_result(file_path, code, metrics)
+            self._cache_result(file_path, stat, file_hash, metrics)
         
         return metrics
     
     def analyze_files(self, file_paths: List[str]) -> Dict[str, ComplexityMetrics]:
         """Analyze multiple files and return aggregated metrics."""
-        results = {}
-        
-        for file_path in file_paths:
-            results[file_path] = self.analyze_file(file_path)
-        
-        return results
+        return dict(zip(file_paths, self._map_files(self.analyze_file, file_paths)))
     
     def get_aggregated_score(self, file_paths: List[str]) -> int:
         """Get aggregated complexity score for multiple files."""
+        # Only the per-file totals are needed, so workers send back plain ints
+        # rather than whole ComplexityMetrics objects
         total_score = 0
-        file_results = self.analyze_files(file_paths)
-        
-        for metrics in file_results.values():
-            total_score += metrics.total_score
+        for score in self._map_files(self._file_score, file_paths):
+            total_score += score
+            
+            # Cap at maximum static score; the remaining files can't change it
+            if total_score >= 40:
+                return 40
         
-        # Cap at maximum static score
-        return min(total_score, 40)
+        return total_score
+    
+    def _file_score(self, file_path: str) -> int:
+        """Get the total complexity score of a single file."""
+        return self.analyze_file(file_path).total_score
+    
+    def _map_files(self, func: Callable[[str], Any], file_paths: List[str]) -> Iterator[Any]:
+        """
+        Apply func to each file path, yielding the results in order.
+        
+        Batches of PARALLEL_MIN_FILES or more are spread across a process pool;
+        smaller batches run serially since pool startup would dominate. Work
+        still queued in the pool is cancelled if the caller stops early.
+        """
+        return map_in_pool(func, file_paths, self.PARALLEL_MIN_FILES)
     
     def _get_analyzer(self, file_extension: str) -> ASTAnalyzer:
         """Get the appropriate analyzer for a file extension."""
-        for analyzer in self.analyzers:
-            if analyzer.supports_language(file_extension):
-                return analyzer
-        
-        # Should never reach here since GenericASTAnalyzer supports all
-        return self.analyzers[-1]
+        # Unclaimed extensions go to GenericASTAnalyzer, which supports all
+        return self._analyzers_by_extension.get(file_extension.lower(), self.analyzers[-1])
     
-    @lru_cache(maxsize=100)
-    def _get_cached_result(self, file_path: str) -> Optional[ComplexityMetrics]:
-        """Get cached analysis result if available and valid."""
-        cache_key = self._get_cache_key(file_path)
-        cache_file = f"/tmp/ast_cache_{cache_key}.json"
+    def _get_cached_result(self, file_path: str, stat: os.stat_result,
+                           file_hash: Optional[str] = None) -> Optional[ComplexityMetrics]:
+        """
+        Get cached analysis result if available and valid.
         
-        if not os.path.exists(cache_file):
-            return None
+        An entry is valid when the file's mtime and size match the recorded
+        ones, or, when file_hash is given, when the content hash matches.
+        """
+        cache_file = self._get_cache_file(file_path)
         
         try:
-            with open(cache_file, 'r') as f:
-                cached_data = json.load(f)
-            
-            # Check if cache is still valid (file not modified)
-            if cached_data.get('file_hash') == self._get_file_hash(file_path):
-                metrics = ComplexityMetrics()
-                metrics.__dict__.update(cached_data['metrics'])
-                return metrics
-        except (json.JSONDecodeError, KeyError, IOError):
-            pass
-        
-        return None
-    
-    def _cache_result(self, file_path: str, _code: str, metrics: ComplexityMetrics) -> None:
-        """Cache analysis result for future use."""
-        cache_key = self._get_cache_key(file_path)
-        cache_file = f"/tmp/ast_cache_{cache_key}.json"
-        
-        cache_data = {
-            'file_hash': self._get_file_hash(file_path),
-            'metrics': metrics.to_dict()
-        }
+            with open(cache_file, 'rb') as f:
+                *values, mtime_ns, size, cached_hash = self._CACHE_RECORD.unpack(f.read())
+        except (struct.error, IOError):
+            return None
         
-        try:
-            os.makedirs("/tmp", exist_ok=True)
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f)
-        except IOError:
-            pass  # Caching is optional
+        # Check if cache is still valid (file not modified)
+        if file_hash is None:
+            if (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+                return None
+        elif cached_hash != bytes.fromhex(file_hash):
+            return None
+        
+        touch_cache_entry(cache_file)
+        metrics = ComplexityMetrics()
+        for field, value in zip(ComplexityMetrics.__slots__, values):
+            setattr(metrics, field, value)
+        return metrics
+    
+    def _cache_result(self, file_path: str, stat: os.stat_result, file_hash: str,
+                      metrics: ComplexityMetrics) -> None:
+        """Cache analysis result, tagged with the stat and hash of the file it came from."""
+        cache_file = self._get_cache_file(file_path)
+        record = self._CACHE_RECORD.pack(
+            *metrics.to_dict().values(),
+            stat.st_mtime_ns, stat.st_size, bytes.fromhex(file_hash)
+        )
+        write_cache_entry(cache_file, record, self._cache_shards)
+    
+    def prune_cache(self) -> None:
+        """Evict the least recently used disk cache entries beyond CACHE_MAX_ENTRIES."""
+        prune_cache_dir(self.cache_dir, self.CACHE_MAX_ENTRIES)
+    
+    def _get_cache_file(self, file_path: str) -> str:
+        """Get the disk cache path for a file."""
+        return cache_entry_path(self.cache_dir, self._get_cache_key(file_path))
     
     def _get_cache_key(self, file_path: str) -> str:
         """Generate cache key for a file."""
-        return hashlib.md5(file_path.encode()).hexdigest()
+        return hashlib.blake2b(file_path.encode(), digest_size=16).hexdigest()
     
-    def _get_file_hash(self, file_path: str) -> str:
-        """Get hash of file content for cache validation."""
-        try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except IOError:
-            return ""
+    def _get_file_hash(self, data: bytes) -> str:
+        """
+        Get hash of file content for cache validation.
+        
+        analyze_file hashes the bytes it has already read for analysis, so
+        the file is never read a second time.
+        """
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 # Global instance for use in cognitive analysis
@@ -10,7 +10,7 @@ The analyzer combines AST-based static code analysis, impact assessment, and AI-
 complexity evaluation to assign cognitive scores and review tiers.
 """
 
-import ast
+import json
 import re
 import os
 from typing import Dict, List, Tuple, Optional
@@ -19,7 +19,7 @@ from pathlib import Path
 from .ai_client_factory import AIClientFactory
 from .ast_analyzer import ast_analyzer
 
-@dataclass
+@dataclass(slots=True)
 class CognitiveScore:
     static_score: int
     impact_score: int
@@ -70,43 +70,108 @@ class ScoringThresholds:
     MEDIUM_FILE_PENALTY = 2
 
 class CognitiveAnalyzer:
+    # Import statements, matched from the start of a line. [^\S\n] is \s
+    # without the newline, so no match can run past the end of its line.
+    _IMPORT_RE = re.compile('|'.join([
+        r'^[^\S\n]*import[^\S\n]+',  # Python/JS imports
+        r'^[^\S\n]*from[^\S\n]+.*[^\S\n]+import',  # Python from imports
+        r'^[^\S\n]*#include[^\S\n]+',  # C/C++ includes
+        r'^[^\S\n]*using[^\S\n]+',  # C# using
+        r'^[^\S\n]*require[^\S\n]*\(',  # Node.js requires
+    ]), re.MULTILINE)
+    # Every import statement above contains one of these
+    _IMPORT_KEYWORDS = ('import', '#include', 'using', 'require')
+    # Line boundaries str.splitlines() recognizes besides '\n'
+    _EXTRA_LINE_BREAKS = ('\r', '\x0b', '\x0c', '\x1c', '\x1d', '\x1e', '\x85', '\u2028', '\u2029')
+    
+    # Content keywords, by category. Substring tests are kept over a compiled
+    # alternation: for a handful of literals, str's C search is several times
+    # faster than a regex scan of the same text.
+    DATABASE_API_PATTERNS = ('database', 'db.', 'api.', 'fetch(', 'axios')
+    COMPLEX_PATTERNS = (
+        'algorithm', 'recursive', 'optimization', 'performance',
+        'threading', 'async', 'promise', 'callback'
+    )
+    BUSINESS_PATTERNS = (
+        'pricing', 'payment', 'billing', 'discount', 'tax',
+        'inventory', 'order', 'subscription'
+    )
+    DATA_STRUCTURE_PATTERNS = ('nested', 'recursive', 'tree', 'graph', 'matrix')
+    
+    # Path keywords of high-impact files that should never auto-merge
+    HIGH_IMPACT_PATTERNS = ('migration', 'schema', 'security', 'payment')
+    
+    # Characters of code sent to the AI model per PR
+    AI_CODE_MAX_CHARS = 2000
+    
     def __init__(self):
-        # Initialize AI client if available, but don't fail without it
-        try:
-            # Validate configuration
-            AIClientFactory.validate_config()
-            
-            # Initialize AI Foundry client
-            self.ai_client = AIClientFactory.create_client()
-        except Exception:
-            # Continue without AI client - AST analysis will still work
-            self.ai_client = None
+        # The AI client is created on first use (see ai_client), so analyses
+        # that never reach AI scoring skip credential lookup and setup
+        self._ai_client = None
+        self._ai_client_initialized = False
+        self._cache_pruned = False  # The AST disk cache is pruned once per analyzer
         
         self.file_impact_weights = {
             'migration': 10, 'schema': 10, 'api': 8, 'config': 6,
             'security': 8, 'payment': 9, 'test': 2, 'doc': 1
         }
     
+    @property
+    def ai_client(self):
+        """AI Foundry client, created on first access; None if unavailable."""
+        if not self._ai_client_initialized:
+            self._ai_client_initialized = True
+            
+            # Initialize AI client if available, but don't fail without it
+            try:
+                # Validate configuration
+                AIClientFactory.validate_config()
+                
+                # Initialize AI Foundry client
+                self._ai_client = AIClientFactory.create_client()
+            except Exception:
+                # Continue without AI client - AST analysis will still work
+                self._ai_client = None
+        
+        return self._ai_client
+    
     def _get_model_name(self) -> str:
         """Get the model deployment name"""
         if self.ai_client:
             return AIClientFactory.get_model_name()
         return "unavailable"
     
-    def analyze_pr(self, pr_files: List[Dict], quality_penalty: int = 0) -> CognitiveScore:
-        """Main entry point for analyzing a PR's cognitive complexity"""
-        static_score = self._calculate_static_score(pr_files)
-        impact_score = self._calculate_impact_score(pr_files)
-        ai_score = self._calculate_ai_score(pr_files)
+    def analyze_pr(self, pr_files: List[Dict], quality_penalty: int = 0,
+                   ai_score: Optional[int] = None) -> CognitiveScore:
+        """
+        Main entry point for analyzing a PR's cognitive complexity
         
-        # Capture detailed AST metrics for PR comments
-        ast_metrics = self._collect_ast_metrics(pr_files)
+        ai_score may be passed when it was already obtained for this PR, as
+        analyze_prs_batch does; otherwise it is computed here.
+        """
+        pr_files = self._with_lowercase(pr_files)
+        
+        # Analyze each file once (across processes for larger PRs); static
+        # scoring, the AST breakdown and the auto-merge check all read from
+        # this table
+        metrics_cache = ast_analyzer.analyze_files([f['path'] for f in pr_files])
+        # The on-disk cache persists across runs; keep it bounded, checking
+        # once per analyzer as QualityGate does
+        if ast_analyzer.cache_enabled and not self._cache_pruned:
+            self._cache_pruned = True
+            ast_analyzer.prune_cache()
+        
+        # Static score and detailed AST metrics for PR comments, in one pass
+        static_score, ast_metrics = self._calculate_static_score(pr_files, metrics_cache)
+        impact_score = self._calculate_impact_score(pr_files)
+        if ai_score is None:
+            ai_score = self._calculate_ai_score(pr_files)
         
         # Add quality penalty to total score
         total_score = static_score + impact_score + ai_score + quality_penalty
         
         # Check for auto-merge eligibility before tier assignment
-        if self._is_auto_merge_eligible(pr_files, total_score):
+        if self._is_auto_merge_eligible(pr_files, total_score, metrics_cache):
             tier = 0
         else:
             tier = self._assign_tier(total_score)
@@ -124,7 +189,49 @@ class CognitiveAnalyzer:
             ast_metrics=ast_metrics
         )
     
-    def _calculate_static_score(self, pr_files: List[Dict]) -> int:
+    def analyze_prs_batch(self, prs: List[List[Dict]],
+                          quality_penalties: Optional[List[int]] = None) -> List[CognitiveScore]:
+        """
+        Analyze several PRs, scoring all of them with a single AI request.
+        
+        Args:
+            prs: Changed files of each PR, in the format analyze_pr takes
+            quality_penalties: Quality penalty per PR (0 for all if omitted);
+                               must have one entry per PR
+            
+        Returns:
+            List[CognitiveScore]: One score per PR, in order
+        """
+        if quality_penalties is None:
+            quality_penalties = [0] * len(prs)
+        elif len(quality_penalties) != len(prs):
+            raise ValueError(f"expected {len(prs)} quality penalties, got {len(quality_penalties)}")
+        
+        # A single PR, or no AI at all, gains nothing from batching
+        if len(prs) <= 1 or not self.ai_client:
+            return [self.analyze_pr(pr_files, penalty)
+                    for pr_files, penalty in zip(prs, quality_penalties)]
+        
+        prs = [self._with_lowercase(pr_files) for pr_files in prs]
+        ai_scores = self._calculate_ai_scores_batch(prs)
+        
+        return [self.analyze_pr(pr_files, penalty, ai_score)
+                for pr_files, penalty, ai_score in zip(prs, quality_penalties, ai_scores)]
+    
+    @staticmethod
+    def _with_lowercase(pr_files: List[Dict]) -> List[Dict]:
+        """
+        Add path_lower and content_lower to each file so that path and keyword
+        scans lowercase them only once.
+        
+        Works on shallow copies, leaving the caller's dicts untouched, and
+        skips files that already carry them.
+        """
+        return [f if 'content_lower' in f else dict(f, path_lower=f['path'].lower(),
+                                                    content_lower=f['content'].lower())
+                for f in pr_files]
+    
+    def _calculate_static_score(self, pr_files: List[Dict], metrics_cache: Dict) -> Tuple[int, Dict]:
         """
         Calculate complexity from AST-based static analysis.
         
@@ -134,28 +241,15 @@ class CognitiveAnalyzer:
         - Function length penalties
         - Language-specific complexity patterns
         
-        Returns: 0-40 points (capped)
-        """
-        total_score = 0
-        
-        for file_info in pr_files:
-            file_path = file_info['path']
-            
-            # Use AST analyzer for precise complexity measurement
-            metrics = ast_analyzer.analyze_file(file_path)
-            score = metrics.total_score
-            
-            # Cap per file to prevent single complex file from dominating
-            total_score += min(score, ScoringThresholds.STATIC_SCORE_PER_FILE_MAX)
+        The same pass collects the detailed per-file AST metrics for PR
+        comments.
         
-        return min(total_score, ScoringThresholds.STATIC_SCORE_MAX)
-    
-    def _collect_ast_metrics(self, pr_files: List[Dict]) -> Dict:
+        Returns: 0-40 points (capped), and the comprehensive breakdown of
+        complexity metrics per file
         """
-        Collect detailed AST metrics for each file for PR comments.
+        total_score = 0
+        per_file_max = ScoringThresholds.STATIC_SCORE_PER_FILE_MAX  # Local for the loop
         
-        Returns comprehensive breakdown of complexity metrics per file.
-        """
         file_metrics = {}
         total_metrics = {
             'total_cyclomatic_complexity': 0,
@@ -168,10 +262,13 @@ class CognitiveAnalyzer:
         for file_info in pr_files:
             file_path = file_info['path']
             
-            # Get detailed AST metrics
-            metrics = ast_analyzer.analyze_file(file_path)
+            # Use AST analyzer for precise complexity measurement
+            metrics = metrics_cache[file_path]
+            
+            # Cap per file to prevent single complex file from dominating
+            total_score += min(metrics.total_score, per_file_max)
             
-            file_data = {
+            file_metrics[file_path] = {
                 'path': file_path,
                 'language': file_info.get('language', 'unknown'),
                 'total_score': metrics.total_score,
@@ -183,8 +280,6 @@ class CognitiveAnalyzer:
                 'file_size_penalty': metrics.file_size_penalty
             }
             
-            file_metrics[file_path] = file_data
-            
             # Update totals
             total_metrics['total_cyclomatic_complexity'] += metrics.cyclomatic_complexity
             total_metrics['max_nesting_depth'] = max(total_metrics['max_nesting_depth'], metrics.nesting_depth)
@@ -199,10 +294,11 @@ class CognitiveAnalyzer:
                     'main_issues': self._identify_complexity_issues(metrics)
                 })
         
-        return {
+        ast_metrics = {
             'files': file_metrics,
             'summary': total_metrics
         }
+        return min(total_score, ScoringThresholds.STATIC_SCORE_MAX), ast_metrics
     
     def _identify_complexity_issues(self, metrics) -> List[str]:
         """Identify the main complexity issues in a file."""
@@ -237,11 +333,19 @@ class CognitiveAnalyzer:
         Returns: 0-30 points (capped)
         """
         impact_score = 0
+        # Thresholds read in the loop, bound to locals once
+        imports_per_point = ScoringThresholds.IMPORTS_PER_POINT
+        imports_max_points = ScoringThresholds.IMPORTS_MAX_POINTS
+        database_api_points = ScoringThresholds.DATABASE_API_POINTS
+        max_score = ScoringThresholds.IMPACT_SCORE_MAX
         
         for file_info in pr_files:
-            file_path = file_info['path'].lower()
+            file_path = file_info['path_lower']
             
-            # File type impact weights
+            # File type impact weights: the first pattern in dict order wins.
+            # Paths are short, so plain substring tests beat a regex here; an
+            # alternation would also prefer the leftmost match, not the first
+            # pattern.
             for pattern, weight in self.file_impact_weights.items():
                 if pattern in file_path:
                     impact_score += weight
@@ -249,16 +353,19 @@ class CognitiveAnalyzer:
             
             # Cross-module dependencies (import counting)
             imports = self._count_imports(file_info['content'])
-            dependency_points = min(imports // ScoringThresholds.IMPORTS_PER_POINT, 
-                                  ScoringThresholds.IMPORTS_MAX_POINTS)
+            dependency_points = min(imports // imports_per_point, imports_max_points)
             impact_score += dependency_points
             
             # Database/API integration changes
-            if any(keyword in file_info['content'].lower() 
-                   for keyword in ['database', 'db.', 'api.', 'fetch(', 'axios']):
-                impact_score += ScoringThresholds.DATABASE_API_POINTS
+            if any(keyword in file_info['content_lower']
+                   for keyword in self.DATABASE_API_PATTERNS):
+                impact_score += database_api_points
+            
+            # Capped already; the remaining files can't change the result
+            if impact_score >= max_score:
+                break
         
-        return min(impact_score, ScoringThresholds.IMPACT_SCORE_MAX)
+        return min(impact_score, max_score)
     
     def _calculate_ai_score(self, pr_files: List[Dict]) -> int:
         """
@@ -279,7 +386,7 @@ class CognitiveAnalyzer:
             
         try:
             # Combine changed code for analysis (limit for API constraints)
-            combined_code = "\n".join([f['content'] for f in pr_files[:3]])
+            combined_code = self._ai_code_excerpt(pr_files)
             
             prompt = f"""
             Analyze this code change for cognitive complexity. Rate 0-30 based on:
@@ -289,7 +396,7 @@ class CognitiveAnalyzer:
             - How much domain knowledge is required?
             
             Code:
-            {combined_code[:2000]}  # Truncate for API limits
+            {combined_code}  # Truncate for API limits
             
             Respond with just a number 0-30.
             """
@@ -314,6 +421,70 @@ class CognitiveAnalyzer:
             print(f"AI analysis failed: {e}, falling back to heuristic scoring")
             return self._heuristic_ai_score(pr_files)
     
+    def _calculate_ai_scores_batch(self, prs: List[List[Dict]]) -> List[int]:
+        """
+        Score several PRs with one AI Foundry request.
+        
+        Each PR's code goes into the prompt as a numbered block and the model
+        answers with a JSON array of scores. Falls back to heuristic scoring
+        for every PR if the request fails or the answer is malformed.
+        
+        Returns: 0-30 points per PR (capped)
+        """
+        try:
+            code_blocks = []
+            for index, pr_files in enumerate(prs, 1):
+                # Combine changed code for analysis (limit for API constraints)
+                combined_code = self._ai_code_excerpt(pr_files)
+                code_blocks.append(f"Change {index}:\n{combined_code}")
+            
+            prompt = f"""
+            Analyze each of these {len(prs)} code changes for cognitive complexity.
+            Rate each one 0-30 based on:
+            - How difficult is this to understand?
+            - Are there complex business rules or algorithms?
+            - Does this use unusual patterns or anti-patterns?
+            - How much domain knowledge is required?
+            
+            {chr(10).join(code_blocks)}
+            
+            Respond with just a JSON array of {len(prs)} numbers 0-30, one per change, in order.
+            """
+            
+            # Make AI Foundry request
+            from azure.ai.inference.models import UserMessage
+            messages = [UserMessage(prompt)]
+            model_name = self._get_model_name()
+            
+            response = self.ai_client.complete(
+                messages=messages,
+                model=model_name,
+                max_tokens=10 * len(prs),
+                temperature=0.1
+            )
+            
+            # Extract the array of scores from the response
+            content = response.choices[0].message.content
+            scores = json.loads(re.search(r'\[.*\]', content, re.DOTALL).group())
+            if len(scores) != len(prs):
+                raise ValueError(f"expected {len(prs)} scores, got {len(scores)}")
+            
+            return [min(max(int(score), 0), ScoringThresholds.AI_SCORE_MAX) for score in scores]
+            
+        except Exception as e:
+            print(f"AI batch analysis failed: {e}, falling back to heuristic scoring")
+            return [self._heuristic_ai_score(pr_files) for pr_files in prs]
+    
+    def _ai_code_excerpt(self, pr_files: List[Dict]) -> str:
+        """
+        Join the first files' code into an excerpt of at most AI_CODE_MAX_CHARS.
+        
+        Each file is cut to the limit before joining, so large files are never
+        copied in full only to be discarded.
+        """
+        limit = self.AI_CODE_MAX_CHARS
+        return "\n".join([f['content'][:limit] for f in pr_files[:3]])[:limit]
+    
     def _heuristic_ai_score(self, pr_files: List[Dict]) -> int:
         """
         Fallback heuristic scoring when AI is unavailable.
@@ -326,36 +497,35 @@ class CognitiveAnalyzer:
         Returns: 0-30 points (capped)
         """
         score = 0
+        # Points awarded and the cap checked in the loop, bound to locals once
+        complex_points = ScoringThresholds.COMPLEX_PATTERN_POINTS
+        business_points = ScoringThresholds.BUSINESS_LOGIC_POINTS
+        data_structure_points = ScoringThresholds.DATA_STRUCTURE_POINTS
+        max_score = ScoringThresholds.AI_SCORE_MAX
         
         for file_info in pr_files:
-            content = file_info['content'].lower()
+            content = file_info['content_lower']
             
             # Complex algorithmic patterns that indicate higher cognitive load
-            complex_patterns = [
-                'algorithm', 'recursive', 'optimization', 'performance',
-                'threading', 'async', 'promise', 'callback'
-            ]
-            if any(pattern in content for pattern in complex_patterns):
-                score += ScoringThresholds.COMPLEX_PATTERN_POINTS
+            if any(pattern in content for pattern in self.COMPLEX_PATTERNS):
+                score += complex_points
             
             # Business logic indicators requiring domain knowledge
-            business_patterns = [
-                'pricing', 'payment', 'billing', 'discount', 'tax',
-                'inventory', 'order', 'subscription'
-            ]
-            if any(pattern in content for pattern in business_patterns):
-                score += ScoringThresholds.BUSINESS_LOGIC_POINTS
+            if any(pattern in content for pattern in self.BUSINESS_PATTERNS):
+                score += business_points
                 
             # Complex data structure manipulation
-            data_structure_patterns = [
-                'nested', 'recursive', 'tree', 'graph', 'matrix'
-            ]
-            if any(pattern in content for pattern in data_structure_patterns):
-                score += ScoringThresholds.DATA_STRUCTURE_POINTS
+            if any(pattern in content for pattern in self.DATA_STRUCTURE_PATTERNS):
+                score += data_structure_points
+            
+            # Capped already; the remaining files can't change the result
+            if score >= max_score:
+                break
         
-        return min(score, ScoringThresholds.AI_SCORE_MAX)
+        return min(score, max_score)
     
-    def _is_auto_merge_eligible(self, pr_files: List[Dict], total_score: int) -> bool:
+    def _is_auto_merge_eligible(self, pr_files: List[Dict], total_score: int,
+                                metrics_cache: Dict) -> bool:
         """
         Check if PR is eligible for auto-merge (Tier 0).
         
@@ -368,6 +538,7 @@ class CognitiveAnalyzer:
         Args:
             pr_files: List of changed files with metadata
             total_score: Combined total score (before tier assignment)
+            metrics_cache: AST metrics per file path, computed once in analyze_pr
             
         Returns:
             bool: True if eligible for auto-merge, False otherwise
@@ -380,19 +551,17 @@ class CognitiveAnalyzer:
         if len(pr_files) > 5:
             return False
             
-        # Check for high-impact file types that should never auto-merge
-        high_impact_patterns = ['migration', 'schema', 'security', 'payment']
-        for file_info in pr_files:
-            file_path = file_info['path'].lower()
-            if any(pattern in file_path for pattern in high_impact_patterns):
-                return False
-                
-        # Check individual file complexity (prevent one complex file from sneaking through)
         for file_info in pr_files:
             file_path = file_info['path']
             
-            # Use AST analyzer for precise complexity measurement
-            metrics = ast_analyzer.analyze_file(file_path)
+            # Check for high-impact file types that should never auto-merge
+            # (cheap path test first, before looking at AST metrics)
+            file_path_lower = file_info['path_lower']
+            if any(pattern in file_path_lower for pattern in self.HIGH_IMPACT_PATTERNS):
+                return False
+            
+            # Check individual file complexity (prevent one complex file from sneaking through)
+            metrics = metrics_cache[file_path]
             file_complexity = metrics.total_score
                 
             # If any single file is too complex, require human review
@@ -433,39 +602,19 @@ class CognitiveAnalyzer:
         else:
             return 2
     
-    def _calculate_nesting_depth(self, node) -> int:
-        """Calculate maximum nesting depth in AST node - deprecated, use AST analyzer instead"""
-        # This method is kept for compatibility but should use AST analyzer
-        max_depth = 0
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.With)):
-                depth = 1
-                parent = child
-                while hasattr(parent, 'parent'):
-                    if isinstance(parent.parent, (ast.If, ast.For, ast.While, ast.With)):
-                        depth += 1
-                    parent = parent.parent
-                max_depth = max(max_depth, depth)
-        return max_depth
-    
     def _count_imports(self, content: str) -> int:
         """Count import statements in code"""
-        import_patterns = [
-            r'^\s*import\s+',  # Python/JS imports
-            r'^\s*from\s+.*\s+import',  # Python from imports
-            r'^\s*#include\s+',  # C/C++ includes
-            r'^\s*using\s+',  # C# using
-            r'^\s*require\s*\(',  # Node.js requires
-        ]
-        
-        count = 0
-        for line in content.splitlines():
-            for pattern in import_patterns:
-                if re.match(pattern, line):
-                    count += 1
-                    break
+        # Cheap substring prefilter: most files without imports never reach
+        # the line normalization and regex scan below
+        if not any(keyword in content for keyword in self._IMPORT_KEYWORDS):
+            return 0
         
-        return count
+        # Normalize every line boundary splitlines() knows to '\n', so the
+        # multiline regex sees exactly the lines a per-line scan would. Plain
+        # '\n' content is scanned as is, without building a list of lines.
+        if any(line_break in content for line_break in self._EXTRA_LINE_BREAKS):
+            content = '\n'.join(content.splitlines())
+        return len(self._IMPORT_RE.findall(content))
     
     def _generate_reasoning(self, static: int, impact: int, ai: int, quality_penalty: int = 0) -> str:
         """Generate human-readable explanation of scoring"""
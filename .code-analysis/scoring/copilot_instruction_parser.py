@@ -7,14 +7,36 @@ principles and standards that should be incorporated into AI-powered quality ana
 
 import os
 import re
-import json
-import hashlib
-from typing import Dict, List, Optional, Set
+import marshal
+import mmap
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 
 
-@dataclass
+# Markdown heading boundary used to split the document into sections
+_SECTION_SPLIT_RE = re.compile(r'\n#+\s+')
+
+# Parses instructions in the background while callers finish initializing
+_PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='copilot-parse')
+
+
+def _read_cache_file(path: str) -> Dict:
+    """Read a marshal cache file."""
+    with open(path, 'rb') as f:
+        return marshal.load(f)
+
+
+def _write_cache_file(path: str, cache_data: Dict):
+    """Write a marshal cache file, replacing any existing one atomically."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        marshal.dump(cache_data, f)
+    os.replace(tmp_path, path)
+
+
+@dataclass(slots=True, frozen=True)
 class CopilotStandards:
     """Extracted coding standards from Copilot instructions."""
     # High-level principles
@@ -25,28 +47,29 @@ class CopilotStandards:
     testing_emphasis: bool = False
     
     # Language-specific preferences
-    preferred_patterns: Optional[List[str]] = None
-    discouraged_patterns: Optional[List[str]] = None
+    preferred_patterns: List[str] = field(default_factory=list)
+    discouraged_patterns: List[str] = field(default_factory=list)
     
     # Project-specific guidelines
-    architectural_principles: Optional[List[str]] = None
-    code_organization: Optional[List[str]] = None
+    architectural_principles: List[str] = field(default_factory=list)
+    code_organization: List[str] = field(default_factory=list)
     
     # Raw extracted sections for AI context
     key_principles: str = ""
-    code_examples: Optional[List[str]] = None
+    code_examples: List[str] = field(default_factory=list)
+    
+    # Field names in declaration order, for to_dict()
+    _FIELDS = (
+        'error_handling_required', 'type_safety_emphasis', 'performance_focus',
+        'documentation_required', 'testing_emphasis',
+        'preferred_patterns', 'discouraged_patterns',
+        'architectural_principles', 'code_organization',
+        'key_principles', 'code_examples',
+    )
     
-    def __post_init__(self):
-        if self.preferred_patterns is None:
-            self.preferred_patterns = []
-        if self.discouraged_patterns is None:
-            self.discouraged_patterns = []
-        if self.architectural_principles is None:
-            self.architectural_principles = []
-        if self.code_organization is None:
-            self.code_organization = []
-        if self.code_examples is None:
-            self.code_examples = []
+    def to_dict(self) -> Dict:
+        """Convert to a dictionary (lists are shared, not copied)."""
+        return {name: getattr(self, name) for name in self._FIELDS}
 
 
 class CopilotInstructionParser:
@@ -55,6 +78,33 @@ class CopilotInstructionParser:
     and principles for use in quality gate analysis.
     """
     
+    # Principle keywords, matched as substrings of the lowercased document.
+    # Keywords that contain a shorter keyword from the same group are left
+    # out ('testing', 'unit test', 'documentation', ...) since they can
+    # never change the result.
+    ERROR_KEYWORDS = ('error handling', 'try/catch', 'exception', 'error management')
+    TYPE_KEYWORDS = ('type safety', 'typescript', 'type hints', 'type annotation')
+    PERFORMANCE_KEYWORDS = ('performance', 'optimization', 'efficiency', 'fast', 'speed')
+    DOCUMENTATION_KEYWORDS = ('jsdoc', 'docstring', 'comment', 'document')
+    TESTING_KEYWORDS = ('test', 'coverage')
+    
+    # Sections mentioning any of these contribute architecture bullets
+    ARCHITECTURE_KEYWORDS = ('architecture', 'structure', 'organization')
+    
+    # Principle flags and how generate_ai_context() describes them
+    PRINCIPLE_MESSAGES = (
+        ('error_handling_required', "Proper error handling is required"),
+        ('type_safety_emphasis', "Type safety is emphasized"),
+        ('performance_focus', "Performance optimization is important"),
+        ('documentation_required', "Code documentation is required"),
+        ('testing_emphasis', "Testing coverage is important"),
+    )
+    
+    # In-process results shared by all parser instances, keyed by the
+    # instruction file's (path, mtime, size)
+    _STANDARDS_CACHE: Dict[Tuple[str, float, int], CopilotStandards] = {}
+    _AI_CONTEXT_CACHE: Dict[Tuple[str, float, int], str] = {}
+    
     def __init__(self, instruction_file_path: str = None):
         """
         Initialize parser with path to Copilot instructions.
@@ -70,8 +120,28 @@ class CopilotInstructionParser:
         else:
             self.instruction_file_path = instruction_file_path
             
-        self.cache_file = ".code-analysis/.copilot-cache.json"
+        self.cache_file = ".code-analysis/.copilot-cache.marshal"
         self._ensure_cache_dir()
+        
+        # Content-addressed entries shared by every checkout on this machine;
+        # COPILOT_CACHE_DIR lets CI point it at a persisted (e.g. actions) cache
+        self.shared_cache_dir = os.environ.get('COPILOT_CACHE_DIR') or os.path.join(
+            os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+            'copilot_instructions'
+        )
+        
+        # Start loading now if get_standards() would have to go past the
+        # per-checkout cache anyway. A valid cache is kept for get_standards()
+        # so a warm start reads it only once
+        self._prefetch: Optional[Tuple[Tuple[str, float, int], Future]] = None
+        self._valid_cache: Optional[Tuple[Tuple[str, float, int], Dict]] = None
+        memo_key = self._memo_key()
+        if memo_key is not None and memo_key not in self._STANDARDS_CACHE:
+            cache_data = self._read_valid_cache()
+            if cache_data is None:
+                self._prefetch = (memo_key, _PARSE_EXECUTOR.submit(self._load_shared_or_parse))
+            else:
+                self._valid_cache = (memo_key, cache_data)
     
     def _ensure_cache_dir(self):
         """Ensure cache directory exists."""
@@ -80,7 +150,7 @@ class CopilotInstructionParser:
         if not cache_dir.is_absolute():
             script_dir = Path(__file__).parent.parent.parent  # Repository root
             cache_dir = script_dir / cache_dir
-            self.cache_file = str(cache_dir / ".copilot-cache.json")
+            self.cache_file = str(cache_dir / ".copilot-cache.marshal")
         cache_dir.mkdir(exist_ok=True)
     
     def get_standards(self) -> CopilotStandards:
@@ -90,66 +160,146 @@ class CopilotInstructionParser:
         Returns:
             CopilotStandards object with extracted principles
         """
-        # Check if we can use cached version
-        if self._is_cache_valid():
-            try:
-                return self._load_from_cache()
-            except Exception:
-                pass  # Fall through to re-parse
-        
-        # Parse instructions and cache result
-        standards = self._parse_instructions()
-        self._save_to_cache(standards)
+        # Reuse standards already loaded by this process
+        memo_key = self._memo_key()
+        if memo_key in self._STANDARDS_CACHE:
+            return self._STANDARDS_CACHE[memo_key]
+        
+        # Use the background parse if the file hasn't changed since it started
+        standards = None
+        if self._prefetch is not None:
+            prefetch_key, future = self._prefetch
+            self._prefetch = None
+            if prefetch_key == memo_key:
+                standards, file_hash = future.result()
+                self._save_to_cache(standards, file_hash)
+        
+        # Check if we can use cached version, unless __init__ already read it
+        # for the same file state
+        if standards is None:
+            if self._valid_cache is not None and self._valid_cache[0] == memo_key:
+                cache_data = self._valid_cache[1]
+            else:
+                cache_data = self._read_valid_cache()
+            self._valid_cache = None
+            if cache_data is not None:
+                try:
+                    standards = self._load_from_cache(cache_data)
+                except Exception:
+                    pass  # Fall through to re-parse
+        
+        if standards is None:
+            standards, file_hash = self._load_shared_or_parse()
+            self._save_to_cache(standards, file_hash)
+        
+        if memo_key is not None:
+            self._STANDARDS_CACHE[memo_key] = standards
         return standards
     
-    def _is_cache_valid(self) -> bool:
-        """Check if cached data is still valid."""
-        if not os.path.exists(self.cache_file):
-            return False
-        
-        if not os.path.exists(self.instruction_file_path):
-            return False
+    def _load_shared_or_parse(self) -> Tuple[CopilotStandards, str]:
+        """
+        Get standards from the shared cache, parsing only if no checkout has yet.
         
+        Returns:
+            The standards and the instruction file's content hash
+        """
+        # Another checkout may already have parsed identical content
+        file_hash = self._get_file_hash()
+        standards = self._load_from_shared_cache(file_hash)
+        if standards is None:
+            standards = self._parse_instructions()
+        return standards, file_hash
+    
+    def _memo_key(self) -> Optional[Tuple[str, float, int]]:
+        """Get the in-process cache key for the instruction file."""
+        try:
+            stat = os.stat(self.instruction_file_path)
+        except OSError:
+            return None
+        return (self.instruction_file_path, stat.st_mtime, stat.st_size)
+    
+    def _read_valid_cache(self) -> Optional[Dict]:
+        """Read the cached data, or return None if it is missing or stale."""
+        # A missing instruction or cache file surfaces as OSError below
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            stat = os.stat(self.instruction_file_path)
+            cache_data = _read_cache_file(self.cache_file)
             
-            # Check file modification time and content hash
-            current_mtime = os.path.getmtime(self.instruction_file_path)
-            current_hash = self._get_file_hash()
+            # Unchanged mtime and size: trust the cache without reading the file
+            if (cache_data.get('file_mtime') == stat.st_mtime and
+                    cache_data.get('file_size') == stat.st_size):
+                return cache_data
             
-            return (cache_data.get('file_mtime') == current_mtime and 
-                    cache_data.get('file_hash') == current_hash)
+            # Metadata changed: only a content change invalidates the cache
+            if cache_data.get('file_hash') != self._get_file_hash():
+                return None
+            
+            cache_data['file_mtime'] = stat.st_mtime
+            cache_data['file_size'] = stat.st_size
+            _write_cache_file(self.cache_file, cache_data)
+            return cache_data
         except Exception:
-            return False
+            return None
     
     def _get_file_hash(self) -> str:
         """Get hash of instruction file content."""
+        # Imported lazily: hashlib pulls in OpenSSL, and a warm cache hit
+        # never needs it
+        import hashlib
+        
         try:
-            with open(self.instruction_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return hashlib.md5(content.encode()).hexdigest()
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(self.instruction_file_path, 'rb') as f:
+                # Hash straight from the page cache; empty files cannot be mapped
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        hasher.update(mapped)
+            return hasher.hexdigest()
         except Exception:
             return ""
     
-    def _load_from_cache(self) -> CopilotStandards:
-        """Load standards from cache."""
-        with open(self.cache_file, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
+    def _load_from_cache(self, cache_data: Optional[Dict] = None) -> CopilotStandards:
+        """Load standards from cache, reading it unless cache_data is given."""
+        if cache_data is None:
+            cache_data = _read_cache_file(self.cache_file)
         
         standards_dict = cache_data['standards']
         return CopilotStandards(**standards_dict)
     
-    def _save_to_cache(self, standards: CopilotStandards):
+    def _get_shared_cache_file(self, file_hash: str) -> str:
+        """Get the shared cache entry for instruction content with this hash."""
+        return os.path.join(self.shared_cache_dir, f"{file_hash[:16]}.marshal")
+    
+    def _load_from_shared_cache(self, file_hash: str) -> Optional[CopilotStandards]:
+        """Load standards parsed from identical content, if any checkout has."""
+        if not file_hash:
+            return None
+        try:
+            return CopilotStandards(**_read_cache_file(self._get_shared_cache_file(file_hash)))
+        except Exception:
+            return None
+    
+    def _save_to_cache(self, standards: CopilotStandards, file_hash: Optional[str] = None):
         """Save standards to cache with metadata."""
+        if file_hash is None:
+            file_hash = self._get_file_hash()
+        stat = os.stat(self.instruction_file_path)
+        standards_dict = standards.to_dict()
         cache_data = {
-            'file_mtime': os.path.getmtime(self.instruction_file_path),
-            'file_hash': self._get_file_hash(),
-            'standards': asdict(standards)
+            'file_mtime': stat.st_mtime,
+            'file_size': stat.st_size,
+            'file_hash': file_hash,
+            'standards': standards_dict
         }
         
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, indent=2)
+        _write_cache_file(self.cache_file, cache_data)
+        
+        if file_hash:
+            try:
+                os.makedirs(self.shared_cache_dir, exist_ok=True)
+                _write_cache_file(self._get_shared_cache_file(file_hash), standards_dict)
+            except OSError:
+                pass  # The shared cache is optional
     
     def _parse_instructions(self) -> CopilotStandards:
         """
@@ -167,69 +317,63 @@ class CopilotInstructionParser:
         except Exception:
             return CopilotStandards()
         
-        standards = CopilotStandards()
-        
-        # Extract high-level principles
-        self._extract_principles(content, standards)
-        
-        # Extract patterns and preferences
-        self._extract_patterns(content, standards)
-        
-        # Extract architectural guidelines
-        self._extract_architecture(content, standards)
-        
-        # Store key sections for AI context
-        standards.key_principles = self._extract_key_sections(content)
-        standards.code_examples = self._extract_code_examples(content)
+        # Blank documents yield the defaults; skip the extractors entirely
+        if not content or content.isspace():
+            return CopilotStandards()
         
-        return standards
+        # Lowercase once; lower() never adds or removes line breaks, so the
+        # lowercased lines stay aligned with the original ones
+        content_lower = content.lower()
+        lines = content.split('\n')
+        lines_lower = content_lower.split('\n')
+        
+        return CopilotStandards(
+            # Extract high-level principles
+            **self._extract_principles(content_lower),
+            # Extract patterns and preferences
+            **self._extract_patterns(lines, lines_lower),
+            # Extract architectural guidelines
+            **self._extract_architecture(content, content_lower),
+            # Store key sections for AI context
+            key_principles=self._extract_key_sections(lines, lines_lower),
+            code_examples=self._extract_code_examples(lines) if '```' in content else [],
+        )
     
-    def _extract_principles(self, content: str, standards: CopilotStandards):
+    def _extract_principles(self, content_lower: str) -> Dict[str, bool]:
         """Extract high-level coding principles."""
-        content_lower = content.lower()
-        
-        # Error handling emphasis
-        error_keywords = ['error handling', 'try/catch', 'exception', 'error management']
-        standards.error_handling_required = any(keyword in content_lower for keyword in error_keywords)
-        
-        # Type safety emphasis
-        type_keywords = ['type safety', 'typescript', 'type hints', 'type annotation']
-        standards.type_safety_emphasis = any(keyword in content_lower for keyword in type_keywords)
-        
-        # Performance focus
-        perf_keywords = ['performance', 'optimization', 'efficiency', 'fast', 'speed']
-        standards.performance_focus = any(keyword in content_lower for keyword in perf_keywords)
-        
-        # Documentation requirements
-        doc_keywords = ['documentation', 'jsdoc', 'docstring', 'comment', 'document']
-        standards.documentation_required = any(keyword in content_lower for keyword in doc_keywords)
-        
-        # Testing emphasis
-        test_keywords = ['test', 'testing', 'unit test', 'integration test', 'coverage']
-        standards.testing_emphasis = any(keyword in content_lower for keyword in test_keywords)
+        return {
+            # Error handling emphasis
+            'error_handling_required': any(keyword in content_lower for keyword in self.ERROR_KEYWORDS),
+            # Type safety emphasis
+            'type_safety_emphasis': any(keyword in content_lower for keyword in self.TYPE_KEYWORDS),
+            # Performance focus
+            'performance_focus': any(keyword in content_lower for keyword in self.PERFORMANCE_KEYWORDS),
+            # Documentation requirements
+            'documentation_required': any(keyword in content_lower for keyword in self.DOCUMENTATION_KEYWORDS),
+            # Testing emphasis
+            'testing_emphasis': any(keyword in content_lower for keyword in self.TESTING_KEYWORDS),
+        }
     
-    def _extract_patterns(self, content: str, standards: CopilotStandards):
+    def _extract_patterns(self, lines: List[str], lines_lower: List[str]) -> Dict[str, List[str]]:
         """Extract preferred and discouraged patterns."""
         # Look for explicit pattern mentions
         preferred_patterns = []
         discouraged_patterns = []
         
         # Find sections about preferences
-        lines = content.split('\n')
         in_prefer_section = False
         in_avoid_section = False
         
-        for line in lines:
-            line_lower = line.lower()
-            
-            # Section detection
-            if any(word in line_lower for word in ['prefer', 'recommended', 'best practice']):
+        for line, line_lower in zip(lines, lines_lower):
+            # Section detection (inline tests; any() over a generator costs more
+            # than the scans themselves on short lines)
+            if 'prefer' in line_lower or 'recommended' in line_lower or 'best practice' in line_lower:
                 in_prefer_section = True
                 in_avoid_section = False
-            elif any(word in line_lower for word in ['avoid', 'don\'t', 'discouraged']):
+            elif 'avoid' in line_lower or 'don\'t' in line_lower or 'discouraged' in line_lower:
                 in_avoid_section = True
                 in_prefer_section = False
-            elif line.startswith('#') or line.startswith('##'):
+            elif line.startswith('#'):
                 in_prefer_section = False
                 in_avoid_section = False
             
@@ -239,68 +383,77 @@ class CopilotInstructionParser:
             elif in_avoid_section and ('var' in line_lower or 'any' in line_lower):
                 discouraged_patterns.append(line.strip())
         
-        standards.preferred_patterns = preferred_patterns
-        standards.discouraged_patterns = discouraged_patterns
+        return {
+            'preferred_patterns': preferred_patterns,
+            'discouraged_patterns': discouraged_patterns,
+        }
     
-    def _extract_architecture(self, content: str, standards: CopilotStandards):
+    def _extract_architecture(self, content: str, content_lower: str) -> Dict[str, List[str]]:
         """Extract architectural principles and code organization guidelines."""
         architectural_principles = []
         code_organization = []
         
+        # No section can qualify if the document never mentions the keywords
+        if not any(word in content_lower for word in self.ARCHITECTURE_KEYWORDS):
+            return {'architectural_principles': [], 'code_organization': []}
+        
         # Look for architecture sections
-        sections = re.split(r'\n#+\s+', content)
+        sections = _SECTION_SPLIT_RE.split(content)
+        sections_lower = _SECTION_SPLIT_RE.split(content_lower)
         
-        for section in sections:
-            self._process_architecture_section(section, architectural_principles, code_organization)
+        for section, section_lower in zip(sections, sections_lower):
+            self._process_architecture_section(section, section_lower, architectural_principles, code_organization)
         
-        standards.architectural_principles = architectural_principles[:5]  # Limit to top 5
-        standards.code_organization = code_organization[:5]
+        return {
+            'architectural_principles': architectural_principles[:5],  # Limit to top 5
+            'code_organization': code_organization[:5],
+        }
     
-    def _process_architecture_section(self, section: str, arch_principles: List[str], code_org: List[str]):
+    def _process_architecture_section(self, section: str, section_lower: str,
+                                      arch_principles: List[str], code_org: List[str]):
         """Process a single section for architecture content."""
-        section_lower = section.lower()
-        
-        if any(word in section_lower for word in ['architecture', 'structure', 'organization']):
+        if any(word in section_lower for word in self.ARCHITECTURE_KEYWORDS):
             # Extract bullet points or key concepts
             lines = section.split('\n')
             for line in lines:
-                if line.strip().startswith('-') or line.strip().startswith('*'):
+                stripped = line.strip()
+                if stripped.startswith(('-', '*')):
                     if 'architecture' in section_lower:
-                        arch_principles.append(line.strip())
+                        arch_principles.append(stripped)
                     else:
-                        code_org.append(line.strip())
+                        code_org.append(stripped)
     
-    def _extract_key_sections(self, content: str) -> str:
+    def _extract_key_sections(self, lines: List[str], lines_lower: List[str]) -> str:
         """Extract key sections for AI context (summarized)."""
         # Find the most important sections (usually at the beginning)
-        lines = content.split('\n')
         key_content = []
         
         # Take first meaningful section after title
         capturing = False
-        for line in lines:
-            if line.startswith('# ') or line.startswith('## '):
-                if any(word in line.lower() for word in ['guideline', 'instruction', 'standard', 'practice']):
+        for line, line_lower in zip(lines, lines_lower):
+            if line.startswith(('# ', '## ')):
+                if any(word in line_lower for word in ['guideline', 'instruction', 'standard', 'practice']):
                     capturing = True
                 elif capturing and line.startswith('#'):
                     break  # Stop at next major section
-            elif capturing and line.strip():
-                key_content.append(line.strip())
-                if len(key_content) > 10:  # Limit size
-                    break
+            elif capturing:
+                stripped = line.strip()
+                if stripped:
+                    key_content.append(stripped)
+                    if len(key_content) > 10:  # Limit size
+                        break
         
         return '\n'.join(key_content)
     
-    def _extract_code_examples(self, content: str) -> List[str]:
+    def _extract_code_examples(self, lines: List[str]) -> List[str]:
         """Extract code examples from instructions."""
         # Find code blocks
         code_examples = []
-        lines = content.split('\n')
         in_code_block = False
         current_example = []
         
         for line in lines:
-            if line.strip().startswith('```'):
+            if line.lstrip().startswith('```'):
                 if in_code_block:
                     # End of code block
                     if current_example:
@@ -322,22 +475,17 @@ class CopilotInstructionParser:
         Returns:
             Formatted string with project coding standards for AI context
         """
+        memo_key = self._memo_key()
+        if memo_key in self._AI_CONTEXT_CACHE:
+            return self._AI_CONTEXT_CACHE[memo_key]
+        
         standards = self.get_standards()
         
         context_parts = []
         
         # Add high-level principles
-        principles = []
-        if standards.error_handling_required:
-            principles.append("Proper error handling is required")
-        if standards.type_safety_emphasis:
-            principles.append("Type safety is emphasized")
-        if standards.performance_focus:
-            principles.append("Performance optimization is important")
-        if standards.documentation_required:
-            principles.append("Code documentation is required")
-        if standards.testing_emphasis:
-            principles.append("Testing coverage is important")
+        principles = [message for attr, message in self.PRINCIPLE_MESSAGES
+                      if getattr(standards, attr)]
         
         if principles:
             context_parts.append(f"Project Principles: {', '.join(principles)}")
@@ -353,4 +501,7 @@ class CopilotInstructionParser:
         if standards.key_principles:
             context_parts.append(f"Key Guidelines: {standards.key_principles[:200]}...")
         
-        return "\n".join(context_parts) if context_parts else "No specific coding standards found."
+        context = "\n".join(context_parts) if context_parts else "No specific coding standards found."
+        if memo_key is not None:
+            self._AI_CONTEXT_CACHE[memo_key] = context
+        return context
@@ -7,13 +7,21 @@ Enhanced with AI-powered code review capabilities.
 """
 
 import ast
+import hashlib
+import marshal
 import re
 import os
-from typing import Dict, List, Tuple, Optional, Set
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate, chain
+from typing import Dict, Iterator, List, Tuple, Optional, Set
 from dataclasses import dataclass
 from pathlib import Path
 from enum import Enum
 from .ai_client_factory import AIClientFactory
+from .analysis_utils import cache_entry_path, default_cache_dir, map_in_pool, prune_cache_dir, touch_cache_entry, write_cache_entry
 from .copilot_instruction_parser import CopilotInstructionParser
 
 
@@ -28,6 +36,104 @@ SUGGESTION_BREAK_FUNCTIONS = "Consider breaking into smaller functions"
 SUGGESTION_USE_ENV_VARS = "Use environment variables or secure vault for secrets"
 SUGGESTION_USE_PARAMETERIZED = "Use parameterized queries or safe alternatives"
 
+# Ticket references that make a TODO/FIXME acceptable
+_TICKET_REFERENCE_RE = re.compile(r'(JIRA-\d+|#\d+|TICKET-\d+)', re.IGNORECASE)
+
+# ASCII characters that Unicode-mode \s treats as whitespace but re.ASCII does not
+_UNICODE_ONLY_SPACE_RE = re.compile('[\x1c-\x1f]')
+
+# Line-based function boundary heuristics for non-Python languages
+_FUNCTION_START_RE = re.compile(r'\s*(function|def|func|fn)\s+(\w+)')
+_FUNCTION_END_RE = re.compile(r'^(def|function|func|fn|\s*class|\s*})')
+
+# Runs the AI review while the static checks work through the files
+_AI_REVIEW_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='quality-gate-ai')
+
+# Statement-list fields of the nodes that can contain a function definition,
+# in ast field order; every other node (expressions etc.) is never descended
+_NESTED_BODY_FIELDS = {
+    ast.Module: ('body',),
+    ast.FunctionDef: ('body',),
+    ast.AsyncFunctionDef: ('body',),
+    ast.ClassDef: ('body',),
+    ast.If: ('body', 'orelse'),
+    ast.For: ('body', 'orelse'),
+    ast.AsyncFor: ('body', 'orelse'),
+    ast.While: ('body', 'orelse'),
+    ast.With: ('body',),
+    ast.AsyncWith: ('body',),
+    ast.Try: ('body', 'handlers', 'orelse', 'finalbody'),
+    ast.ExceptHandler: ('body',),
+    ast.Match: ('cases',),
+    ast.match_case: ('body',),
+}
+if hasattr(ast, 'TryStar'):  # Python 3.11+
+    _NESTED_BODY_FIELDS[ast.TryStar] = ('body', 'handlers', 'orelse', 'finalbody')
+
+
+@lru_cache(maxsize=256)
+def _parse_python(content: str) -> ast.Module:
+    """
+    Parse Python source, memoized so re-analyzing unchanged files skips parsing.
+    
+    Trees are shared between callers and must not be modified.
+    """
+    return ast.parse(content)
+
+
+def _ascii_twin(pattern: re.Pattern) -> re.Pattern:
+    """Recompile a str pattern with re.ASCII, under which \\b, \\s and case folding are cheaper."""
+    return re.compile(pattern.pattern, (pattern.flags & ~re.UNICODE) | re.ASCII)
+
+
+class _LineIndex:
+    """
+    Per-file line data shared by the checks, each part built on first use.
+    
+    Lines are split on line feeds only, not with splitlines(), so line
+    numbers stay the same as before.
+    """
+    
+    __slots__ = ('content', '_lines', '_line_starts', '_ascii_mode')
+    
+    def __init__(self, content: str):
+        self.content = content
+        self._lines = None
+        self._line_starts = None
+        self._ascii_mode = None
+    
+    @property
+    def ascii_mode(self) -> bool:
+        """
+        Whether re.ASCII patterns match this text exactly like Unicode ones.
+        
+        True for ASCII text without the \\x1c-\\x1f separators, the only
+        ASCII characters on which the two modes disagree.
+        """
+        if self._ascii_mode is None:
+            self._ascii_mode = (self.content.isascii()
+                                and not _UNICODE_ONLY_SPACE_RE.search(self.content))
+        return self._ascii_mode
+    
+    @property
+    def lines(self) -> List[str]:
+        """Get the file's lines."""
+        if self._lines is None:
+            self._lines = self.content.split('\n')
+        return self._lines
+    
+    def line_number(self, offset: int) -> int:
+        """Get the line containing offset (same as counting the newlines before it)."""
+        if self._line_starts is None:
+            # Start offset of every line, plus one past the end of the last
+            line_lengths = map(len, self.lines)
+            self._line_starts = list(accumulate(map((1).__add__, line_lengths), initial=0))
+        return bisect_right(self._line_starts, offset)
+    
+    def line(self, line_number: int) -> str:
+        """Get the text of a 1-based line."""
+        return self.lines[line_number - 1]
+
 
 class QualityLevel(Enum):
     """Quality issue severity levels."""
@@ -36,7 +142,7 @@ class QualityLevel(Enum):
     ADVISORY = "advisory"  # Suggestion only
 
 
-@dataclass
+@dataclass(slots=True)
 class QualityIssue:
     """Represents a single quality issue."""
     level: QualityLevel
@@ -47,7 +153,7 @@ class QualityIssue:
     suggestion: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QualityGateResult:
     """Result of quality gate analysis."""
     passed: bool
@@ -67,47 +173,107 @@ class QualityGate:
     and provide early feedback to developers. Enhanced with AI-powered analysis.
     """
     
+    # PRs with at least this many files run the static checks in a process
+    # pool; below it, pool startup costs more than the checks themselves
+    PARALLEL_MIN_FILES = 32
+    
+    # Upper bound on disk cache entries kept by prune_cache
+    CACHE_MAX_ENTRIES = 10000
+    
     def __init__(self, enable_ai: bool = True):
         """Initialize Quality Gate with optional AI capabilities."""
         self.enable_ai = enable_ai
-        self.ai_client = None
-        
-        # Initialize Copilot instruction parser for project standards
-        self.copilot_parser = CopilotInstructionParser()
-        
-        # Initialize AI client if enabled
-        if self.enable_ai:
-            try:
-                AIClientFactory.validate_config()
-                self.ai_client = AIClientFactory.create_client()
-            except Exception as e:
-                print(f"AI client initialization failed: {e}. AI analysis disabled.")
-                self.enable_ai = False
         
+        # The AI client and the Copilot instruction parser are created on
+        # first use (see ai_client and copilot_parser), so static-only runs
+        # skip credential lookup and standards parsing
+        self._ai_client = None
+        self._ai_client_initialized = False
+        self._copilot_parser = None
+        # (standards, rendered prompt context) of the last AI review
+        self._standards_context: Optional[Tuple[object, str]] = None
+        
+        # Python function findings are cached on disk by file content, so
+        # re-runs over unchanged files skip parsing them
+        self.cache_enabled = True
+        self.cache_dir = default_cache_dir('quality_gate')
+        self._cache_shards = set()  # Shard directories already created
+        self._cache_pruned = False  # prune_cache runs once per gate
+        
+        # Patterns are compiled once here rather than on every file
+        # Each security pattern is paired with a lowercase literal it cannot
+        # match without, so most files skip the regex scans entirely
+        security_flags = re.IGNORECASE | re.MULTILINE
         self.security_patterns = {
             'hardcoded_secrets': [
-                r'password\s*=\s*["\'][^"\']+["\']',
-                r'api_key\s*=\s*["\'][^"\']+["\']',
-                r'secret\s*=\s*["\'][^"\']+["\']',
-                r'token\s*=\s*["\'][^"\']+["\']'
+                ('password', re.compile(r'password\s*=\s*["\'][^"\']+["\']', security_flags)),
+                ('api_key', re.compile(r'api_key\s*=\s*["\'][^"\']+["\']', security_flags)),
+                ('secret', re.compile(r'secret\s*=\s*["\'][^"\']+["\']', security_flags)),
+                ('token', re.compile(r'token\s*=\s*["\'][^"\']+["\']', security_flags))
             ],
             'sql_injection': [
-                r'execute\s*\(\s*["\'].*%.*["\']',
-                r'query\s*\(\s*["\'].*\+.*["\']'
+                ('execute', re.compile(r'execute\s*\(\s*["\'].*%.*["\']', security_flags)),
+                ('query', re.compile(r'query\s*\(\s*["\'].*\+.*["\']', security_flags))
             ],
             'unsafe_eval': [
-                r'\beval\s*\(',
-                r'\bexec\s*\('
+                ('eval', re.compile(r'\beval\s*\(', security_flags)),
+                ('exec', re.compile(r'\bexec\s*\(', security_flags))
             ]
         }
         
         self.code_smell_patterns = {
-            'unused_imports': r'^import\s+\w+(?:\s+as\s+\w+)?$',
-            'todo_fixme': r'#\s*(TODO|FIXME|HACK|XXX)',
-            'print_debug': r'\bprint\s*\(',
-            'console_log': r'\bconsole\.(log|debug|info)\s*\('
+            'unused_imports': re.compile(r'^import\s+\w+(?:\s+as\s+\w+)?$', re.MULTILINE),
+            'todo_fixme': re.compile(r'#\s*(TODO|FIXME|HACK|XXX)', re.IGNORECASE),
+            'print_debug': re.compile(r'\bprint\s*\('),
+            'console_log': re.compile(r'\bconsole\.(log|debug|info)\s*\(')
+        }
+        
+        # re.ASCII twins of both tables, used for files where they match the
+        # same (see _LineIndex.ascii_mode), which is most source code
+        self._ascii_security_patterns = {
+            category: [(literal, _ascii_twin(pattern)) for literal, pattern in patterns]
+            for category, patterns in self.security_patterns.items()
+        }
+        self._ascii_code_smell_patterns = {
+            name: _ascii_twin(pattern) for name, pattern in self.code_smell_patterns.items()
         }
     
+    def __getstate__(self):
+        # Pool workers only run the static checks; the AI client and the
+        # instruction parser stay in the parent process
+        state = self.__dict__.copy()
+        state.update(enable_ai=False, _ai_client=None, _ai_client_initialized=True,
+                     _copilot_parser=None, _standards_context=None)
+        return state
+    
+    @property
+    def ai_client(self):
+        """AI Foundry client, created on first access; None if disabled or unavailable."""
+        if not self._ai_client_initialized:
+            self._ai_client_initialized = True
+            
+            if self.enable_ai:
+                try:
+                    AIClientFactory.validate_config()
+                    self._ai_client = AIClientFactory.create_client()
+                except Exception as e:
+                    print(f"AI client initialization failed: {e}. AI analysis disabled.")
+                    self.enable_ai = False
+        
+        return self._ai_client
+    
+    @property
+    def copilot_parser(self) -> CopilotInstructionParser:
+        """Copilot instruction parser for project standards, created on first access."""
+        if self._copilot_parser is None:
+            self._copilot_parser = CopilotInstructionParser()
+        return self._copilot_parser
+    
+    @staticmethod
+    def clear_caches():
+        """Drop memoized parse trees, e.g. between unrelated batches of PRs."""
+        _parse_python.cache_clear()
+    
     def analyze_pr(self, pr_files: List[Dict]) -> QualityGateResult:
         """
         Main entry point for quality gate analysis.
@@ -122,36 +288,36 @@ class QualityGate:
         warning_issues = []
         advisory_issues = []
         
-        for file_info in pr_files:
-            file_path = file_info['path']
-            content = file_info['content']
-            language = file_info.get('language', 'unknown')
-            
-            # Security checks
-            security_issues = self._check_security(file_path, content)
-            blocking_issues.extend([i for i in security_issues if i.level == QualityLevel.BLOCKING])
-            warning_issues.extend([i for i in security_issues if i.level == QualityLevel.WARNING])
-            
-            # Code smell checks
-            smell_issues = self._check_code_smells(file_path, content, language)
-            blocking_issues.extend([i for i in smell_issues if i.level == QualityLevel.BLOCKING])
-            warning_issues.extend([i for i in smell_issues if i.level == QualityLevel.WARNING])
-            advisory_issues.extend([i for i in smell_issues if i.level == QualityLevel.ADVISORY])
-            
-            # Function complexity checks
-            complexity_issues = self._check_function_complexity(file_path, content, language)
-            warning_issues.extend(complexity_issues)
-            
-            # Documentation checks
-            doc_issues = self._check_documentation(file_path, content, language)
-            advisory_issues.extend(doc_issues)
-        
-        # AI-powered quality analysis (if enabled)
+        # AI-powered quality analysis (if enabled) only needs the raw files,
+        # so the request is in flight while the static checks run
+        ai_review = None
         if self.enable_ai and self.ai_client:
-            ai_issues = self._ai_quality_analysis(pr_files)
-            blocking_issues.extend([i for i in ai_issues if i.level == QualityLevel.BLOCKING])
-            warning_issues.extend([i for i in ai_issues if i.level == QualityLevel.WARNING])
-            advisory_issues.extend([i for i in ai_issues if i.level == QualityLevel.ADVISORY])
+            ai_review = _AI_REVIEW_EXECUTOR.submit(self._ai_quality_analysis, pr_files)
+        
+        for file_blocking, file_warning, file_advisory in self._map_files(pr_files):
+            blocking_issues.extend(file_blocking)
+            warning_issues.extend(file_warning)
+            advisory_issues.extend(file_advisory)
+        # The on-disk cache persists across runs; keep it bounded
+        if self.cache_enabled and not self._cache_pruned:
+            self._cache_pruned = True
+            self.prune_cache()
+        
+        if ai_review is not None:
+            # Drop AI findings the static checks already reported at the same
+            # place, so one problem is not counted twice
+            static_findings = {(i.file_path, i.line_number, i.category)
+                               for i in chain(blocking_issues, warning_issues, advisory_issues)}
+            ai_issues = [i for i in ai_review.result()
+                         if i.line_number is None
+                         or (i.file_path, i.line_number, i.category) not in static_findings]
+            self._partition_issues(ai_issues, blocking_issues, warning_issues, advisory_issues)
+        
+        # A line can trip the same check more than once (e.g. both the
+        # 'password' and 'secret' patterns); report each finding once
+        blocking_issues = self._dedupe_issues(blocking_issues)
+        warning_issues = self._dedupe_issues(warning_issues)
+        advisory_issues = self._dedupe_issues(advisory_issues)
         
         # Calculate overall quality score and determine if gate passes
         quality_score = self._calculate_quality_score(blocking_issues, warning_issues, advisory_issues)
@@ -171,15 +337,95 @@ class QualityGate:
             quality_penalty=quality_penalty
         )
     
-    def _check_security(self, file_path: str, content: str) -> List[QualityIssue]:
+    def _check_file(self, file_info: Dict) -> Tuple[List[QualityIssue], List[QualityIssue], List[QualityIssue]]:
+        """
+        Run the static checks on one file.
+        
+        Returns:
+            Tuple of (blocking, warning, advisory) issues
+        """
+        blocking_issues = []
+        warning_issues = []
+        advisory_issues = []
+        
+        file_path = file_info['path']
+        content = file_info['content']
+        language = file_info.get('language', 'unknown')
+        line_index = _LineIndex(content)
+        
+        # Security checks
+        security_issues = self._check_security(file_path, content, line_index)
+        self._partition_issues(security_issues, blocking_issues, warning_issues, advisory_issues)
+        
+        # Code smell checks
+        smell_issues = self._check_code_smells(file_path, content, language, line_index)
+        self._partition_issues(smell_issues, blocking_issues, warning_issues, advisory_issues)
+        
+        # Function complexity and documentation checks (one AST pass for Python)
+        if language == 'python':
+            complexity_issues, doc_issues = self._check_python_functions_cached(file_path, content)
+        else:
+            complexity_issues = self._check_generic_functions(file_path, content, line_index)
+            doc_issues = []
+        warning_issues.extend(complexity_issues)
+        advisory_issues.extend(doc_issues)
+        
+        return blocking_issues, warning_issues, advisory_issues
+    
+    @staticmethod
+    def _dedupe_issues(issues: List[QualityIssue]) -> List[QualityIssue]:
+        """Drop repeats of a finding (same file, line, category and message), keeping the first."""
+        seen = set()
+        unique_issues = []
+        for issue in issues:
+            key = (issue.file_path, issue.line_number, issue.category, issue.message)
+            if key not in seen:
+                seen.add(key)
+                unique_issues.append(issue)
+        return unique_issues
+    
+    @staticmethod
+    def _partition_issues(issues: List[QualityIssue], blocking_issues: List[QualityIssue],
+                          warning_issues: List[QualityIssue], advisory_issues: List[QualityIssue]):
+        """Append each issue to the list for its level, in one pass."""
+        for issue in issues:
+            level = issue.level
+            if level is QualityLevel.BLOCKING:
+                blocking_issues.append(issue)
+            elif level is QualityLevel.WARNING:
+                warning_issues.append(issue)
+            elif level is QualityLevel.ADVISORY:
+                advisory_issues.append(issue)
+    
+    def _map_files(self, pr_files: List[Dict]) -> Iterator[Tuple[List[QualityIssue], List[QualityIssue], List[QualityIssue]]]:
+        """
+        Run _check_file on each file, yielding the results in order.
+        
+        PRs of PARALLEL_MIN_FILES or more are spread across a process pool;
+        smaller ones run serially since pool startup would dominate. Checks still
+        queued in the pool are cancelled if the caller stops early.
+        """
+        return map_in_pool(self._check_file, pr_files, self.PARALLEL_MIN_FILES)
+    
+    def _check_security(self, file_path: str, content: str,
+                        line_index: Optional[_LineIndex] = None) -> List[QualityIssue]:
         """Check for security vulnerabilities."""
         issues = []
         
-        for category, patterns in self.security_patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-                for match in matches:
-                    line_no = content[:match.start()].count('\n') + 1
+        # The literal prefilter is only exact for ASCII text: IGNORECASE also
+        # folds a few non-ASCII letters (e.g. 'ſ', 'ı') onto ASCII ones
+        content_lower = content.lower() if content.isascii() else None
+        if line_index is None:
+            line_index = _LineIndex(content)
+        security_patterns = (self._ascii_security_patterns if line_index.ascii_mode
+                             else self.security_patterns)
+        
+        for category, patterns in security_patterns.items():
+            for literal, pattern in patterns:
+                if content_lower is not None and literal not in content_lower:
+                    continue
+                for match in pattern.finditer(content):
+                    line_no = line_index.line_number(match.start())
                     
                     if category == 'hardcoded_secrets':
                         issues.append(QualityIssue(
@@ -202,18 +448,23 @@ class QualityGate:
         
         return issues
     
-    def _check_code_smells(self, file_path: str, content: str, language: str) -> List[QualityIssue]:
+    def _check_code_smells(self, file_path: str, content: str, language: str,
+                           line_index: Optional[_LineIndex] = None) -> List[QualityIssue]:
         """Check for code smells."""
         issues = []
+        if line_index is None:
+            line_index = _LineIndex(content)
+        code_smell_patterns = (self._ascii_code_smell_patterns if line_index.ascii_mode
+                               else self.code_smell_patterns)
         
         # Check TODO/FIXME comments for ticket references
-        todo_matches = re.finditer(self.code_smell_patterns['todo_fixme'], content, re.IGNORECASE)
+        todo_matches = code_smell_patterns['todo_fixme'].finditer(content) if '#' in content else ()
         for match in todo_matches:
-            line_no = content[:match.start()].count('\n') + 1
-            line_content = content.split('\n')[line_no - 1]
+            line_no = line_index.line_number(match.start())
+            line_content = line_index.line(line_no)
             
             # Check if TODO has a ticket reference (JIRA, GitHub issue, etc.)
-            if not re.search(r'(JIRA-\d+|#\d+|TICKET-\d+)', line_content, re.IGNORECASE):
+            if not _TICKET_REFERENCE_RE.search(line_content):
                 issues.append(QualityIssue(
                     level=QualityLevel.WARNING,
                     category=CATEGORY_CODE_QUALITY,
@@ -225,9 +476,9 @@ class QualityGate:
         
         # Debug print statements
         if language == 'python':
-            print_matches = re.finditer(self.code_smell_patterns['print_debug'], content)
+            print_matches = code_smell_patterns['print_debug'].finditer(content) if 'print' in content else ()
             for match in print_matches:
-                line_no = content[:match.start()].count('\n') + 1
+                line_no = line_index.line_number(match.start())
                 issues.append(QualityIssue(
                     level=QualityLevel.WARNING,
                     category=CATEGORY_CODE_QUALITY,
@@ -238,9 +489,9 @@ class QualityGate:
                 ))
         
         elif language in ['javascript', 'typescript']:
-            console_matches = re.finditer(self.code_smell_patterns['console_log'], content)
+            console_matches = code_smell_patterns['console_log'].finditer(content) if 'console.' in content else ()
             for match in console_matches:
-                line_no = content[:match.start()].count('\n') + 1
+                line_no = line_index.line_number(match.start())
                 issues.append(QualityIssue(
                     level=QualityLevel.WARNING,
                     category=CATEGORY_CODE_QUALITY,
@@ -252,32 +503,83 @@ class QualityGate:
         
         return issues
     
-    def _check_function_complexity(self, file_path: str, content: str, language: str) -> List[QualityIssue]:
-        """Check for overly complex functions."""
-        issues = []
+    def _check_python_functions(self, file_path: str,
+                                content: str) -> Tuple[List[QualityIssue], List[QualityIssue]]:
+        """
+        Check Python function complexity and documentation in one AST pass.
         
-        if language == 'python':
-            issues.extend(self._check_python_functions(file_path, content))
-        else:
-            issues.extend(self._check_generic_functions(file_path, content))
+        Returns:
+            Tuple of (complexity issues, documentation issues)
+        """
+        complexity_issues = []
+        doc_issues = []
         
-        return issues
+        try:
+            tree = _parse_python(content)
+        except SyntaxError:
+            # File has syntax errors, will be caught by other tools
+            return complexity_issues, doc_issues
+        
+        # Breadth-first like ast.walk, so issues keep the same order, but only
+        # through statement bodies
+        queue = deque([tree])
+        while queue:
+            node = queue.popleft()
+            node_type = type(node)
+            if node_type is ast.FunctionDef:
+                complexity_issues.extend(self._check_single_python_function(file_path, node))
+                type_hint_issue = self._check_python_type_hints(file_path, node)
+                if type_hint_issue:
+                    doc_issues.append(type_hint_issue)
+            for field in _NESTED_BODY_FIELDS.get(node_type, ()):
+                queue.extend(getattr(node, field))
+        
+        return complexity_issues, doc_issues
     
-    def _check_python_functions(self, file_path: str, content: str) -> List[QualityIssue]:
-        """Check Python-specific function complexity."""
-        issues = []
+    def _check_python_functions_cached(self, file_path: str,
+                                       content: str) -> Tuple[List[QualityIssue], List[QualityIssue]]:
+        """
+        _check_python_functions, backed by the on-disk cache.
+        
+        Entries are keyed by content alone and store the findings without the
+        file path, which is filled back in on a hit.
+        """
+        if not self.cache_enabled:
+            return self._check_python_functions(file_path, content)
         
+        cache_file = self._get_cache_file(content)
         try:
-            tree = ast.parse(content)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    issues.extend(self._check_single_python_function(file_path, node))
+            with open(cache_file, 'rb') as f:
+                records = marshal.loads(f.read())
+            touch_cache_entry(cache_file)
+            return tuple(
+                [QualityIssue(level=QualityLevel(level), category=category, message=message,
+                              file_path=file_path, line_number=line_number, suggestion=suggestion)
+                 for level, category, message, line_number, suggestion in group]
+                for group in records
+            )
+        except (IOError, EOFError, ValueError, TypeError):
+            pass  # Not cached yet, or an unreadable entry that gets rewritten
         
-        except SyntaxError:
-            # File has syntax errors, will be caught by other tools
-            pass
+        complexity_issues, doc_issues = self._check_python_functions(file_path, content)
+        records = tuple(
+            tuple((i.level.value, i.category, i.message, i.line_number, i.suggestion) for i in group)
+            for group in (complexity_issues, doc_issues)
+        )
         
-        return issues
+        write_cache_entry(cache_file, marshal.dumps(records), self._cache_shards)
+        
+        return complexity_issues, doc_issues
+    
+    def prune_cache(self) -> None:
+        """Evict the least recently used disk cache entries beyond CACHE_MAX_ENTRIES."""
+        prune_cache_dir(self.cache_dir, self.CACHE_MAX_ENTRIES)
+    
+    def _get_cache_file(self, content: str) -> str:
+        """Get the disk cache path for a file's content."""
+        cache_key = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'),
+                                    digest_size=16).hexdigest()
+        return cache_entry_path(self.cache_dir, cache_key)
     
     def _check_single_python_function(self, file_path: str, node: ast.FunctionDef) -> List[QualityIssue]:
         """Check a single Python function for issues."""
@@ -309,17 +611,18 @@ class QualityGate:
         
         return issues
     
-    def _check_generic_functions(self, file_path: str, content: str) -> List[QualityIssue]:
+    def _check_generic_functions(self, file_path: str, content: str,
+                                 line_index: Optional[_LineIndex] = None) -> List[QualityIssue]:
         """Check function complexity for non-Python languages."""
         issues = []
-        lines = content.split('\n')
+        lines = line_index.lines if line_index is not None else content.split('\n')
         in_function = False
         func_start = 0
         func_name = "unknown"
         
         for i, line in enumerate(lines):
             # Simple heuristic for function detection
-            func_match = re.match(r'\s*(function|def|func|fn)\s+(\w+)', line)
+            func_match = _FUNCTION_START_RE.match(line)
             if func_match:
                 if in_function and i - func_start > 100:
                     issues.append(QualityIssue(
@@ -334,7 +637,7 @@ class QualityGate:
                 in_function = True
                 func_start = i
                 func_name = func_match.group(2)
-            elif in_function and re.match(r'^(def|function|func|fn|\s*class|\s*})', line):
+            elif in_function and _FUNCTION_END_RE.match(line):
                 if i - func_start > 100:
                     issues.append(QualityIssue(
                         level=QualityLevel.WARNING,
@@ -348,33 +651,22 @@ class QualityGate:
         
         return issues
     
-    def _check_documentation(self, file_path: str, content: str, language: str) -> List[QualityIssue]:
-        """Check for documentation quality."""
-        issues = []
-        
-        # Check for type hints in Python
-        if language == 'python':
-            try:
-                tree = ast.parse(content)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        # Check if function has type hints
-                        has_return_annotation = node.returns is not None
-                        has_arg_annotations = any(arg.annotation for arg in node.args.args)
-                        
-                        if not has_return_annotation and not has_arg_annotations:
-                            issues.append(QualityIssue(
-                                level=QualityLevel.ADVISORY,
-                                category=CATEGORY_TYPE_SAFETY,
-                                message=f"Function '{node.name}' missing type hints",
-                                file_path=file_path,
-                                line_number=node.lineno,
-                                suggestion="Add type hints for better code clarity"
-                            ))
-            except SyntaxError:
-                pass
-        
-        return issues
+    def _check_python_type_hints(self, file_path: str, node: ast.FunctionDef) -> Optional[QualityIssue]:
+        """Check a single Python function for type hints."""
+        has_return_annotation = node.returns is not None
+        has_arg_annotations = any(arg.annotation for arg in node.args.args)
+        
+        if has_return_annotation or has_arg_annotations:
+            return None
+        
+        return QualityIssue(
+            level=QualityLevel.ADVISORY,
+            category=CATEGORY_TYPE_SAFETY,
+            message=f"Function '{node.name}' missing type hints",
+            file_path=file_path,
+            line_number=node.lineno,
+            suggestion="Add type hints for better code clarity"
+        )
     
     def _calculate_quality_score(self, blocking: List[QualityIssue], 
                                 warning: List[QualityIssue], 
@@ -501,14 +793,15 @@ Focus on issues that static analysis might miss, such as:
             content = file_info['content']
             language = file_info.get('language', 'unknown')
             
-            # Add file header with context
-            file_section = f"\n--- File: {file_path} (Language: {language}) ---\n{content}\n"
+            # Add file header with context; size it before copying the content
+            file_header = f"\n--- File: {file_path} (Language: {language}) ---\n"
+            section_length = len(file_header) + len(content) + 1
             
-            if total_length + len(file_section) > max_length:
+            if total_length + section_length > max_length:
                 break
                 
-            changes.append(file_section)
-            total_length += len(file_section)
+            changes.append(f"{file_header}{content}\n")
+            total_length += section_length
         
         return "\n".join(changes)
     
@@ -563,6 +856,19 @@ Focus on issues that static analysis might miss, such as:
     
     def _build_standards_context(self, standards) -> str:
         """Build context from project's Copilot instructions for AI analysis."""
+        # get_standards() hands back the same memoized object while the
+        # instructions are unchanged, so the rendered text can be reused
+        cached = self._standards_context
+        if cached is not None and cached[0] is standards:
+            return cached[1]
+        
+        context = self._render_standards_context(standards)
+        self._standards_context = (standards, context)
+        return context
+    
+    @staticmethod
+    def _render_standards_context(standards) -> str:
+        """Render the standards as the project-specific part of the AI prompt."""
         context_parts = []
         
         if standards.key_principles: